@@ -0,0 +1,97 @@
+"""
+Benchmark de l'export d'éphéméride en flux (GET /api/missions/<id>/export)
+
+Génère des rapports GMAT satellite synthétiques de tailles croissantes, puis
+mesure pour chacun le pic de mémoire (RSS) d'un processus qui consomme tout
+l'export. La mémoire doit rester plate quand la taille du rapport augmente.
+
+Usage (depuis AfreeLeo_Cost_Calculator-main/) :
+    python benchmarks/bench_export.py --sizes-mb 10 100 1024 --format oem --gzip
+"""
+
+import argparse
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+COLUMNS = ['UTCGregorian', 'ElapsedSecs', 'Earth.Altitude', 'Earth.Latitude', 'Earth.Longitude',
+           'EarthMJ2000Eq.VX', 'EarthMJ2000Eq.VY', 'EarthMJ2000Eq.VZ',
+           'EarthMJ2000Eq.X', 'EarthMJ2000Eq.Y', 'EarthMJ2000Eq.Z']
+
+
+def write_report(path, size_mb, name='BenchSat', step=10.0):
+    """Écrit un rapport au format GMAT (FixedWidth, ColumnWidth 23) d'environ size_mb Mo"""
+    target = size_mb * 1024 * 1024
+    epoch = datetime(2026, 10, 10, 12, 0, 0)
+    radius, mu = 7058.0, 398600.4418
+    n = math.sqrt(mu / radius ** 3)
+    with open(path, 'w') as f:
+        f.write(' '.join(f'{name}.{c}'.ljust(26) for c in COLUMNS) + '\n')
+        i = 0
+        while f.tell() < target:
+            t = i * step
+            c, s = math.cos(n * t), math.sin(n * t)
+            v = radius * n
+            date = (epoch + timedelta(seconds=t)).strftime('%d %b %Y %H:%M:%S.%f')[:-3]
+            values = [t, 700.0, 0.0, 0.0, -v * s, v * c, 0.0, radius * c, radius * s, 0.0]
+            f.write(date.ljust(26) + ' ' + ' '.join(repr(x).ljust(26) for x in values) + '\n')
+            i += 1
+
+
+def measure(report_path, export_format, step, compress):
+    """Consomme l'export complet et affiche : octets, secondes, pic RSS (Mo)"""
+    from script import EphemerisExporter
+
+    start = time.perf_counter()
+    total = 0
+    for chunk in EphemerisExporter.export(report_path, export_format, 'bench', step=step, compress=compress):
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{total} {elapsed:.3f} {peak_rss_mb:.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes-mb', type=int, nargs='+', default=[10, 100, 1024])
+    parser.add_argument('--format', default='oem', choices=['oem', 'csv', 'jsonl'])
+    parser.add_argument('--step', type=float, default=None, help="Resampling step in seconds")
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.format, args.step, args.gzip)
+        return
+
+    print(f"{'report':>10} {'output':>12} {'time (s)':>10} {'MB/s':>8} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in args.sizes_mb:
+            report_path = Path(tmp_dir) / f'report_{size_mb}.txt'
+            write_report(report_path, size_mb)
+            report_size = os.path.getsize(report_path) / (1024 * 1024)
+
+            # Un processus neuf par mesure pour que le pic RSS soit propre à cette taille
+            command = [sys.executable, __file__, '--measure', str(report_path), '--format', args.format]
+            if args.step:
+                command += ['--step', str(args.step)]
+            if args.gzip:
+                command.append('--gzip')
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout.split()
+            total, elapsed, peak_rss = int(output[0]), float(output[1]), float(output[2])
+
+            print(f'{report_size:>8.0f}MB {total / (1024 * 1024):>10.1f}MB {elapsed:>10.2f} '
+                  f'{report_size / elapsed:>8.1f} {peak_rss:>14.1f}')
+            report_path.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark du coût par mission : génération du script et exécution de GMAT
+
+1. Génération du script : template compilé une fois (GMATScriptGenerator.MISSION_SCRIPT)
+   comparé à un template ré-analysé à chaque appel (string.Template.substitute)
+2. Exécution GMAT : installation directe (données lues depuis l'installation)
+   comparée au bac à sable préparé (GMATSandbox, données sur tmpfs)
+
+Usage (depuis AfreeLeo_Cost_Calculator-main/, config.json requis, GMAT installé) :
+    python benchmarks/bench_gmat_runs.py --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from string import Template
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import script  # noqa: E402
+
+PARAMS = {
+    "mission_name": "Benchmark",
+    "satellite_name": "Bench Sat",
+    "satellite_mass": 10,
+    "target_altitude": 680,
+    "orbit_type": "equatorial_dakar",
+    "launch_date": "2026-10-10",
+    "deorbit_mode": "standard"
+}
+
+
+def bench_script_generation(number):
+    generator = script.GMATScriptGenerator
+    inputs = generator.mission_inputs(PARAMS)
+    values = dict(
+        inputs, mission_name=PARAMS['mission_name'], generated="2026-10-10 12:00:00", mission_id="bench",
+        satellite_state=generator.render(generator.KEPLERIAN_STATE, dict(inputs, name=inputs['sat'], ta=0)),
+        upper_stage_state=generator.render(generator.KEPLERIAN_STATE, dict(inputs, name='UpperStage', ta=0.1)),
+        mission_sequence=""
+    )
+    compiled = timeit.timeit(
+        lambda: script.GMATScriptGenerator.render(script.GMATScriptGenerator.MISSION_SCRIPT, values),
+        number=number) / number
+    reparsed = timeit.timeit(
+        lambda: Template(script.MISSION_SCRIPT_TEMPLATE).substitute(values), number=number) / number
+    full = timeit.timeit(
+        lambda: script.GMATScriptGenerator.generate_script(PARAMS, 'bench'), number=number) / number
+
+    print("Script generation (per call)")
+    print(f"  template re-parsed per call : {reparsed * 1e6:8.1f} us")
+    print(f"  compiled template           : {compiled * 1e6:8.1f} us")
+    print(f"  generate_script (total)     : {full * 1e6:8.1f} us")
+
+
+def time_runs(command_for, work_dir, runs):
+    durations = []
+    for i in range(runs):
+        script_path = work_dir / f'mission_bench{i}.script'
+        script_path.write_text(script.GMATScriptGenerator.generate_script(PARAMS, f'bench{i}'))
+        start = time.perf_counter()
+        result = subprocess.run(command_for(script_path), capture_output=True, text=True, cwd=str(work_dir))
+        durations.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"GMAT failed: {result.stderr}")
+    return durations
+
+
+def bench_gmat_runs(runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(tmp_dir)
+
+        cold = time_runs(lambda path: [script.get_config().gmat_path, '-r', str(path)], work_dir, runs)
+
+        start = time.perf_counter()
+        sandbox = script.GMATSandbox('bench', root=work_dir / 'sandboxes').prepare()
+        prepare_time = time.perf_counter() - start
+        warm = time_runs(sandbox.command, work_dir, runs)
+
+    print(f"GMAT execution ({runs} runs, median)")
+    print(f"  install tree                : {statistics.median(cold):8.3f} s")
+    print(f"  prepared sandbox            : {statistics.median(warm):8.3f} s")
+    print(f"  saving per run              : {statistics.median(cold) - statistics.median(warm):8.3f} s")
+    print(f"  sandbox preparation (once)  : {prepare_time:8.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help="GMAT runs per configuration")
+    parser.add_argument('--number', type=int, default=20000, help="Script generations to time")
+    parser.add_argument('--skip-gmat', action='store_true', help="Only benchmark script generation")
+    args = parser.parse_args()
+
+    bench_script_generation(args.number)
+    if not args.skip_gmat:
+        bench_gmat_runs(args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark du démarrage du backend : import du module et première requête
+
+Chaque mesure se fait dans un processus neuf (comme un worker gunicorn qui démarre) :
+1. import de script.py (aucune configuration lue, aucun dossier créé)
+2. create_app() puis première requête GET /api/health (configuration chargée et
+   validée, GMAT recherché), et requête suivante (tout est en cache)
+
+Le benchmark échoue (code de sortie 1) si une médiane dépasse son budget.
+La configuration est générée dans un dossier temporaire : ni config.json ni GMAT requis.
+
+Usage (depuis AfreeLeo_Cost_Calculator-main/) :
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MEASURE = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import script
+imported = time.perf_counter()
+client = script.create_app().test_client()
+assert client.get('/api/health').status_code == 200
+first = time.perf_counter()
+client.get('/api/health')
+second = time.perf_counter()
+print((imported - start) * 1000, (first - imported) * 1000, (second - first) * 1000)
+"""
+
+
+def measure(runs, env):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', MEASURE, str(BACKEND_DIR)],
+                                capture_output=True, text=True, check=True, env=env).stdout.split()
+        total = (time.perf_counter() - start) * 1000
+        samples.append([float(value) for value in output] + [total])
+    return [statistics.median(column) for column in zip(*samples)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-import-ms', type=float, default=500.0,
+                        help="Budget for 'import script' (median)")
+    parser.add_argument('--budget-first-request-ms', type=float, default=100.0,
+                        help="Budget for create_app() + first request (median)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = Path(tmp_dir) / 'config.json'
+        with open(config_path, 'w') as f:
+            json.dump({
+                "gmat": {"bin_dir": f"{tmp_dir}/gmat/bin", "output_dir": f"{tmp_dir}/gmat/output"},
+                "missions_dir": f"{tmp_dir}/missions_data"
+            }, f)
+        env = {key: value for key, value in os.environ.items() if not key.startswith('AFREELEO_')}
+        env['AFREELEO_CONFIG'] = str(config_path)
+
+        import_ms, first_ms, next_ms, process_ms = measure(args.runs, env)
+        created = sorted(p.name for p in Path(tmp_dir).iterdir() if p.name != 'config.json')
+
+    print(f"Startup ({args.runs} fresh processes, median)")
+    print(f"  import script               : {import_ms:8.1f} ms  (budget {args.budget_import_ms:.0f} ms)")
+    print(f"  create_app + first request  : {first_ms:8.1f} ms  (budget {args.budget_first_request_ms:.0f} ms)")
+    print(f"  next request                : {next_ms:8.1f} ms")
+    print(f"  whole process               : {process_ms:8.1f} ms")
+    print(f"  created at startup          : {', '.join(created) or 'nothing'}")
+
+    over_budget = import_ms > args.budget_import_ms or first_ms > args.budget_first_request_ms
+    if over_budget:
+        print("Startup time over budget")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
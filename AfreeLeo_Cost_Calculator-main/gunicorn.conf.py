@@ -0,0 +1,31 @@
+"""
+Configuration gunicorn du backend AFREELEO
+
+    gunicorn "script:create_app()"
+
+L'application est importée une fois dans le processus maître (preload_app) et
+héritée par les workers au fork : un worker démarré pour absorber un pic de charge
+n'importe rien et ne relit pas la configuration. Les services propres à chaque
+processus (spool, cache des checkpoints, bac à sable GMAT) sont créés après le fork.
+"""
+
+import os
+
+bind = os.environ.get('AFREELEO_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+# Les requêtes de mission attendent GMAT ou les workers du spool : un thread par requête
+worker_class = 'gthread'
+threads = int(os.environ.get('AFREELEO_THREADS', 4))
+preload_app = True
+
+
+def on_starting(server):
+    # Configuration validée et GMAT recherché une seule fois, dans le maître
+    import script
+    config = script.get_config()
+    server.log.info(f"GMAT: {config.probe_gmat()}, missions: {config.missions_dir}")
+
+
+def post_fork(server, worker):
+    import script
+    script.init_worker_process()
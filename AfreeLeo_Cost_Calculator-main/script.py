@@ -3,26 +3,60 @@ AFREELEO Mission Calculator Backend
 Flask API pour génération et exécution de missions GMAT
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Blueprint, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import subprocess
 import os
 import uuid
 import json
 import math
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import shutil
 from pathlib import Path
+from string import Template
 import csv
+import time
+import socket
+import threading
+import argparse
+import signal
+import zlib
+import atexit
+import tempfile
+import hashlib
+import re
+
+# Routes de l'API, enregistrées sur l'application créée par create_app()
+api = Blueprint('api', __name__)
+
+# Fichier de configuration par défaut (la variable AFREELEO_CONFIG en désigne un autre)
+DEFAULT_CONFIG_PATH = Path(__file__).parent / "config.json"
+
+# Variables d'environnement qui remplacent une valeur de config.json : (section, clé)
+ENV_OVERRIDES = {
+    'AFREELEO_GMAT_BIN_DIR': ('gmat', 'bin_dir'),
+    'AFREELEO_GMAT_OUTPUT_DIR': ('gmat', 'output_dir'),
+    'AFREELEO_GMAT_DATA_DIR': ('gmat', 'data_dir'),
+    'AFREELEO_MISSIONS_DIR': (None, 'missions_dir'),
+    'AFREELEO_CHECKPOINTS_DIR': (None, 'checkpoints_dir'),
+    'AFREELEO_SPOOL_ENABLED': ('spool', 'enabled'),
+    'AFREELEO_SPOOL_DIR': ('spool', 'dir'),
+    'AFREELEO_SANDBOX_ENABLED': ('sandbox', 'enabled'),
+    'AFREELEO_SANDBOX_DIR': ('sandbox', 'dir')
+}
+
+# Exécutables GMAT en console, cherchés dans cet ordre dans bin_dir
+GMAT_CONSOLE_NAMES = ("GmatConsole.exe", "GmatConsole")
 
-app = Flask(__name__)
-CORS(app)
 
 # Load configuration from config.json
-def load_config():
+def load_config(config_path=None):
     """Load GMAT paths from config.json"""
-    config_path = Path(__file__).parent / "config.json"
+    config_path = Path(config_path or os.environ.get('AFREELEO_CONFIG') or DEFAULT_CONFIG_PATH)
     if not config_path.exists():
+        if os.environ.get('AFREELEO_GMAT_BIN_DIR') and os.environ.get('AFREELEO_GMAT_OUTPUT_DIR'):
+            # Chemins GMAT fournis par l'environnement : config.json facultatif
+            return {}
         raise FileNotFoundError(
             f"Configuration file not found: {config_path}\n"
             "Please create config.json with GMAT installation paths."
@@ -30,14 +64,189 @@ def load_config():
     with open(config_path, 'r') as f:
         return json.load(f)
 
-config = load_config()
 
-# Configuration
-GMAT_BIN_DIR = config['gmat']['bin_dir']
-GMAT_PATH = os.path.join(GMAT_BIN_DIR, "GmatConsole.exe")
-GMAT_OUTPUT_DIR = Path(config['gmat']['output_dir'])
-MISSIONS_DIR = Path("./missions_data")
-MISSIONS_DIR.mkdir(exist_ok=True)
+def apply_env_overrides(data):
+    """Copie de la configuration avec les valeurs des variables AFREELEO_*"""
+    data = {key: dict(value) if isinstance(value, dict) else value for key, value in data.items()}
+    for variable, (section, key) in ENV_OVERRIDES.items():
+        value = os.environ.get(variable)
+        if value is None:
+            continue
+        if key == 'enabled':
+            value = value.strip().lower() in ('1', 'true', 'yes', 'on')
+        target = data.setdefault(section, {}) if section else data
+        target[key] = value
+    return data
+
+
+def write_json_atomic(path, data):
+    """
+    Écriture atomique d'un fichier JSON (fichier temporaire + os.replace) : un
+    lecteur concurrent (API, worker, autre processus) ne voit jamais de fichier partiel
+    """
+    tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex[:8]}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class BackendConfig:
+    """
+    Configuration validée du backend (config.json + variables d'environnement).
+
+    Construite au premier appel de get_config(), jamais à l'import du module : le
+    module s'importe sans config.json ni installation GMAT. L'exécutable GMAT est
+    recherché une seule fois par processus (probe_gmat).
+    """
+
+    def __init__(self, data):
+        data = apply_env_overrides(data)
+
+        gmat = data.get('gmat', {})
+        missing = [f'gmat.{key}' for key in ('bin_dir', 'output_dir') if not gmat.get(key)]
+        if missing:
+            raise ValueError(f"Invalid configuration: missing {', '.join(missing)}")
+
+        # Configuration
+        self.gmat_bin_dir = gmat['bin_dir']
+        self.gmat_output_dir = Path(gmat['output_dir'])
+        self.gmat_data_dir = Path(gmat.get('data_dir', os.path.join(self.gmat_bin_dir, '..', 'data')))
+        self.missions_dir = Path(data.get('missions_dir', './missions_data'))
+        # Phase checkpoints (shared between missions with the same inputs, e.g. deorbit mode comparisons)
+        self.checkpoints_dir = Path(data.get('checkpoints_dir', './checkpoints_data'))
+
+        # Worker fleet configuration (shared spool directory)
+        spool = data.get('spool', {})
+        self.spool_enabled = bool(spool.get('enabled', False))
+        self.spool_dir = Path(spool.get('dir', './spool_data'))
+        self.spool_capacity = spool.get('capacity', 1)
+        self.lease_seconds = spool.get('lease_seconds', 60)
+        self.heartbeat_seconds = spool.get('heartbeat_seconds', 10)
+        self.max_attempts = spool.get('max_attempts', 3)
+        self.wait_timeout_seconds = spool.get('wait_timeout_seconds', 900)
+        for key in ('capacity', 'lease_seconds', 'heartbeat_seconds', 'max_attempts', 'wait_timeout_seconds'):
+            value = getattr(self, 'spool_capacity' if key == 'capacity' else key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"Invalid configuration: spool.{key} must be a positive number")
+        if self.heartbeat_seconds >= self.lease_seconds / 2:
+            # Sinon les baux expirent avant d'être renouvelés et chaque mission est exécutée deux fois
+            raise ValueError("Invalid configuration: spool.heartbeat_seconds must be less than half "
+                             "of spool.lease_seconds")
+
+        # Warm GMAT sandbox configuration (data files staged on local fast storage / tmpfs)
+        sandbox = data.get('sandbox', {})
+        self.sandbox_enabled = bool(sandbox.get('enabled', False))
+        self.sandbox_root = Path(sandbox.get(
+            'dir', '/dev/shm/afreeleo_sandboxes' if os.path.isdir('/dev/shm')
+            else os.path.join(tempfile.gettempdir(), 'afreeleo_sandboxes')))
+        # Sous-dossiers de data/ copiés dans le bac à sable (le reste est lié symboliquement)
+        self.sandbox_staged_data = sandbox.get('staged_data', [
+            'gravity/earth', 'atmosphere/earth', 'planetary_ephem/de', 'planetary_coeff', 'time'
+        ])
+        # Plugins inutiles pour les missions en console (non chargés au démarrage de GMAT)
+        self.sandbox_disabled_plugins = sandbox.get('disabled_plugins', [
+            'Matlab', 'Python', 'OpenFrames', 'Estimation', 'Yukon', 'Vf13', 'Snopt', 'Ipopt'
+        ])
+
+        self._gmat_probe = None
+
+    def probe_gmat(self):
+        """
+        Recherche GmatConsole.exe (Windows) ou GmatConsole (Linux/macOS) dans bin_dir.
+        Résultat mis en cache : le health check ne touche plus au disque.
+        """
+        if self._gmat_probe is None:
+            candidates = [os.path.join(self.gmat_bin_dir, name) for name in GMAT_CONSOLE_NAMES]
+            default = candidates[0] if os.name == 'nt' else candidates[1]
+            path = next((c for c in candidates if os.path.isfile(c)), default)
+            self._gmat_probe = {
+                "gmat_path": path,
+                "gmat_available": os.path.isfile(path) and os.access(path, os.X_OK)
+            }
+        return self._gmat_probe
+
+    @property
+    def gmat_path(self):
+        return self.probe_gmat()['gmat_path']
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_config():
+    """Configuration du processus, chargée et validée au premier appel"""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = BackendConfig(load_config())
+    return _config
+
+
+def configure(config=None):
+    """
+    Remplace la configuration du processus : dict, chemin d'un fichier JSON, ou
+    None pour la recharger au prochain accès. Les services qui en dépendent
+    (spool, cache des checkpoints, bac à sable) sont recréés à la demande ; le bac
+    à sable courant est supprimé. À appeler au démarrage (ou entre deux tests),
+    pas pendant que des missions s'exécutent.
+    """
+    global _config, _mission_spool, _checkpoint_store, gmat_sandbox
+    with _config_lock:
+        if config is None:
+            _config = None
+        else:
+            _config = BackendConfig(config if isinstance(config, dict) else load_config(config))
+        _mission_spool = None
+        _checkpoint_store = None
+    # Hors de _config_lock : get_gmat_sandbox() prend les deux verrous dans l'ordre inverse
+    with gmat_sandbox_lock:
+        previous_sandbox, gmat_sandbox = gmat_sandbox, None
+    if previous_sandbox is not None:
+        atexit.unregister(previous_sandbox.cleanup)
+        previous_sandbox.cleanup()
+
+
+def create_app(config=None):
+    """
+    Fabrique de l'application Flask. La configuration est celle du processus, pas
+    de l'application : create_app(config) appelle configure(config), ce qui
+    reconfigure aussi les applications déjà créées dans ce processus. Sans
+    argument, la configuration est lue au premier besoin (AFREELEO_CONFIG ou
+    config.json).
+    """
+    if config is not None:
+        configure(config)
+    app = Flask(__name__)
+    CORS(app)
+    app.register_blueprint(api)
+    return app
+
+
+def init_worker_process():
+    """
+    À appeler dans chaque processus après un fork (hook post_fork de gunicorn) :
+    les services sont propres au processus, et le bac à sable GMAT est préparé en
+    arrière-plan pour que la première mission n'attende pas. Avec le spool, l'API
+    n'exécute jamais GMAT (les workers préparent leur propre bac à sable).
+    """
+    global _mission_spool, _checkpoint_store, gmat_sandbox
+    _mission_spool = None
+    _checkpoint_store = None
+    gmat_sandbox = None
+    config = get_config()
+    if config.sandbox_enabled and not config.spool_enabled:
+        threading.Thread(target=get_gmat_sandbox, daemon=True).start()
+
+
+def __getattr__(name):
+    # Compatibilité (ex. gunicorn script:app) : application créée au premier accès
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Pricing configuration
 PRICING_PD1 = {
@@ -71,107 +280,40 @@ PRICING_PD3 = {
 }
 
 
-class GMATScriptGenerator:
-    """Générateur de scripts GMAT personnalisés"""
-    
-    @staticmethod
-    def generate_script(params, mission_id):
-        """
-        Génère un script GMAT à partir des paramètres client
-        """
-        # Calculs dérivés
-        sma = 6378 + params['target_altitude']
-
-        # Parse launch date and convert to GMAT format (DD Mon YYYY)
-        launch_date_str = params['launch_date']
-        if 'T' in launch_date_str:
-            # ISO datetime format, extract date only
-            launch_date_str = launch_date_str.split('T')[0]
-
-        # Convert YYYY-MM-DD to DD Mon YYYY format for GMAT
-        try:
-            date_obj = datetime.strptime(launch_date_str, '%Y-%m-%d')
-            launch_date = date_obj.strftime('%d %b %Y')
-        except:
-            # Fallback to original if parsing fails
-            launch_date = launch_date_str
-
-        # Mapping type d'orbite vers inclinaison
-        orbit_inclinations = {
-            "equatorial": 0,
-            "equatorial_dakar": 14.7,
-            "heliosynchronous": 98,
-            "polar": 90,
-            "custom": params.get('custom_inclination', 14.7)
-        }
-        inclination = orbit_inclinations.get(params['orbit_type'], 14.7)
-        
-        # Mapping mode désorbitation vers durée burn
-        deorbit_modes = {
-            "rapid": 300,      # 5 minutes
-            "standard": 120,   # 2 minutes
-            "gentle": 60       # 1 minute
-        }
-        burn_duration = deorbit_modes.get(params['deorbit_mode'], 300)
-        
-        # Calcul masse carburant pour l'étage supérieur
-        # Masse étage = 10% de la masse payload (estimation)
-        upper_stage_mass = max(100.0, params['satellite_mass'] * 10)
-        # Carburant Eco-Brake = 15% de la masse étage
-        upper_stage_fuel = max(15.0, upper_stage_mass * 0.15)
-
-        # Génération du script GMAT
-        script = f"""
+# Template du script GMAT de mission (syntaxe string.Template : ${emplacement})
+MISSION_SCRIPT_TEMPLATE = """
 %==================================================================================
-% AFREELEO Mission: {params['mission_name']}
-% Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-% Mission ID: {mission_id}
+% AFREELEO Mission: ${mission_name}
+% Generated: ${generated}
+% Mission ID: ${mission_id}
 %==================================================================================
 
 %----------------------------------------
 %---------- Spacecraft (Satellite Payload)
 %----------------------------------------
 
-Create Spacecraft {params['satellite_name'].replace(' ', '_')};
-{params['satellite_name'].replace(' ', '_')}.DateFormat = UTCGregorian;
-{params['satellite_name'].replace(' ', '_')}.Epoch = '{launch_date} 12:00:00.000';
-{params['satellite_name'].replace(' ', '_')}.CoordinateSystem = EarthMJ2000Eq;
-{params['satellite_name'].replace(' ', '_')}.DisplayStateType = Keplerian;
-{params['satellite_name'].replace(' ', '_')}.SMA = {sma};
-{params['satellite_name'].replace(' ', '_')}.ECC = {params.get('eccentricity', 0)};
-{params['satellite_name'].replace(' ', '_')}.INC = {inclination};
-{params['satellite_name'].replace(' ', '_')}.RAAN = 0;
-{params['satellite_name'].replace(' ', '_')}.AOP = 0;
-{params['satellite_name'].replace(' ', '_')}.TA = 0;
-{params['satellite_name'].replace(' ', '_')}.DryMass = {params['satellite_mass']};
-{params['satellite_name'].replace(' ', '_')}.Cd = 2.2;
-{params['satellite_name'].replace(' ', '_')}.Cr = 1.8;
-{params['satellite_name'].replace(' ', '_')}.DragArea = 0.1;
-{params['satellite_name'].replace(' ', '_')}.SRPArea = 0.1;
-{params['satellite_name'].replace(' ', '_')}.SPADDragScaleFactor = 1;
-{params['satellite_name'].replace(' ', '_')}.SPADSRPScaleFactor = 1;
-{params['satellite_name'].replace(' ', '_')}.AtmosDensityScaleFactor = 1;
-{params['satellite_name'].replace(' ', '_')}.NAIFId = -10003001;
-{params['satellite_name'].replace(' ', '_')}.NAIFIdReferenceFrame = -9003001;
-{params['satellite_name'].replace(' ', '_')}.OrbitColor = Cyan;
-{params['satellite_name'].replace(' ', '_')}.TargetColor = DarkGray;
+Create Spacecraft ${sat};
+${satellite_state}
+${sat}.DryMass = ${satellite_mass};
+${sat}.Cd = 2.2;
+${sat}.Cr = 1.8;
+${sat}.DragArea = 0.1;
+${sat}.SRPArea = 0.1;
+${sat}.SPADDragScaleFactor = 1;
+${sat}.SPADSRPScaleFactor = 1;
+${sat}.AtmosDensityScaleFactor = 1;
+${sat}.NAIFId = -10003001;
+${sat}.NAIFIdReferenceFrame = -9003001;
+${sat}.OrbitColor = Cyan;
+${sat}.TargetColor = DarkGray;
 
 %----------------------------------------
 %---------- Upper Stage (Rocket Stage 3)
 %----------------------------------------
 
 Create Spacecraft UpperStage;
-UpperStage.DateFormat = UTCGregorian;
-UpperStage.Epoch = '{launch_date} 12:00:00.000';
-UpperStage.CoordinateSystem = EarthMJ2000Eq;
-UpperStage.DisplayStateType = Keplerian;
-UpperStage.SMA = {sma};
-UpperStage.ECC = {params.get('eccentricity', 0)};
-UpperStage.INC = {inclination};
-UpperStage.RAAN = 0;
-UpperStage.AOP = 0;
-UpperStage.TA = 0.1;
-UpperStage.DryMass = {upper_stage_mass};
+${upper_stage_state}
+UpperStage.DryMass = ${upper_stage_mass};
 UpperStage.Cd = 2.2;
 UpperStage.Cr = 1.8;
 UpperStage.DragArea = 2.5;
@@ -190,7 +332,7 @@ UpperStage.TargetColor = Maroon;
 
 Create ChemicalTank EcoBrakeFuelTank;
 EcoBrakeFuelTank.AllowNegativeFuelMass = false;
-EcoBrakeFuelTank.FuelMass = {upper_stage_fuel};
+EcoBrakeFuelTank.FuelMass = ${upper_stage_fuel};
 EcoBrakeFuelTank.Pressure = 1500;
 EcoBrakeFuelTank.Temperature = 20;
 EcoBrakeFuelTank.RefTemperature = 20;
@@ -208,21 +350,21 @@ EcoBrakeThruster.ThrustDirection3 = 0;
 EcoBrakeThruster.DutyCycle = 1;
 EcoBrakeThruster.ThrustScaleFactor = 1;
 EcoBrakeThruster.DecrementMass = true;
-EcoBrakeThruster.Tank = {{EcoBrakeFuelTank}};
+EcoBrakeThruster.Tank = {EcoBrakeFuelTank};
 EcoBrakeThruster.MixRatio = [ 1 ];
 EcoBrakeThruster.GravitationalAccel = 9.81;
 EcoBrakeThruster.C1 = 10;
 EcoBrakeThruster.K1 = 200;
 
-UpperStage.Tanks = {{EcoBrakeFuelTank}};
-UpperStage.Thrusters = {{EcoBrakeThruster}};
+UpperStage.Tanks = {EcoBrakeFuelTank};
+UpperStage.Thrusters = {EcoBrakeThruster};
 
 %----------------------------------------
 %---------- Burns
 %----------------------------------------
 
 Create FiniteBurn DeorbitBurn;
-DeorbitBurn.Thrusters = {{EcoBrakeThruster}};
+DeorbitBurn.Thrusters = {EcoBrakeThruster};
 DeorbitBurn.ThrottleLogicAlgorithm = 'MaxNumberOfThrusters';
 
 %----------------------------------------
@@ -231,8 +373,8 @@ DeorbitBurn.ThrottleLogicAlgorithm = 'MaxNumberOfThrusters';
 
 Create ForceModel LEOProp_ForceModel;
 LEOProp_ForceModel.CentralBody = Earth;
-LEOProp_ForceModel.PrimaryBodies = {{Earth}};
-LEOProp_ForceModel.PointMasses = {{Luna, Sun}};
+LEOProp_ForceModel.PrimaryBodies = {Earth};
+LEOProp_ForceModel.PointMasses = {Luna, Sun};
 LEOProp_ForceModel.SRP = On;
 LEOProp_ForceModel.RelativisticCorrection = Off;
 LEOProp_ForceModel.ErrorControl = RSSStep;
@@ -273,9 +415,9 @@ LEOProp.StopIfAccuracyIsViolated = true;
 %----------------------------------------
 
 Create ReportFile SatelliteReport;
-SatelliteReport.Filename = 'mission_{mission_id}_satellite.txt';
+SatelliteReport.Filename = 'mission_${mission_id}_satellite.txt';
 SatelliteReport.Precision = 16;
-SatelliteReport.Add = {{{params['satellite_name'].replace(' ', '_')}.UTCGregorian, {params['satellite_name'].replace(' ', '_')}.ElapsedSecs, {params['satellite_name'].replace(' ', '_')}.Earth.Altitude, {params['satellite_name'].replace(' ', '_')}.Earth.Latitude, {params['satellite_name'].replace(' ', '_')}.Earth.Longitude, {params['satellite_name'].replace(' ', '_')}.EarthMJ2000Eq.VX, {params['satellite_name'].replace(' ', '_')}.EarthMJ2000Eq.VY, {params['satellite_name'].replace(' ', '_')}.EarthMJ2000Eq.VZ}};
+SatelliteReport.Add = {${sat}.UTCGregorian, ${sat}.ElapsedSecs, ${sat}.Earth.Altitude, ${sat}.Earth.Latitude, ${sat}.Earth.Longitude, ${sat}.EarthMJ2000Eq.VX, ${sat}.EarthMJ2000Eq.VY, ${sat}.EarthMJ2000Eq.VZ, ${sat}.EarthMJ2000Eq.X, ${sat}.EarthMJ2000Eq.Y, ${sat}.EarthMJ2000Eq.Z};
 SatelliteReport.WriteHeaders = true;
 SatelliteReport.LeftJustify = On;
 SatelliteReport.ZeroFill = Off;
@@ -285,9 +427,9 @@ SatelliteReport.ColumnWidth = 23;
 SatelliteReport.WriteReport = true;
 
 Create ReportFile UpperStageReport;
-UpperStageReport.Filename = 'mission_{mission_id}_upperstage.txt';
+UpperStageReport.Filename = 'mission_${mission_id}_upperstage.txt';
 UpperStageReport.Precision = 16;
-UpperStageReport.Add = {{UpperStage.UTCGregorian, UpperStage.ElapsedSecs, UpperStage.Earth.Altitude, UpperStage.EcoBrakeFuelTank.FuelMass, UpperStage.TotalMass}};
+UpperStageReport.Add = {UpperStage.UTCGregorian, UpperStage.ElapsedSecs, UpperStage.Earth.Altitude, UpperStage.EcoBrakeFuelTank.FuelMass, UpperStage.TotalMass};
 UpperStageReport.WriteHeaders = true;
 UpperStageReport.LeftJustify = On;
 UpperStageReport.ZeroFill = Off;
@@ -296,6 +438,17 @@ UpperStageReport.Delimiter = ' ';
 UpperStageReport.ColumnWidth = 23;
 UpperStageReport.WriteReport = true;
 
+Create ReportFile CheckpointReport;
+CheckpointReport.Filename = 'mission_${mission_id}_checkpoints.txt';
+CheckpointReport.Precision = 16;
+CheckpointReport.WriteHeaders = false;
+CheckpointReport.LeftJustify = On;
+CheckpointReport.ZeroFill = Off;
+CheckpointReport.FixedWidth = true;
+CheckpointReport.Delimiter = ' ';
+CheckpointReport.ColumnWidth = 23;
+CheckpointReport.WriteReport = true;
+
 %----------------------------------------
 %---------- Mission Sequence
 %----------------------------------------
@@ -304,56 +457,289 @@ BeginMissionSequence;
 
 Toggle SatelliteReport On;
 Toggle UpperStageReport On;
+${mission_sequence}
+Toggle SatelliteReport Off;
+Toggle UpperStageReport Off;
+"""
 
+# État initial képlérien (début de mission)
+KEPLERIAN_STATE_TEMPLATE = """${name}.DateFormat = UTCGregorian;
+${name}.Epoch = '${launch_date} 12:00:00.000';
+${name}.CoordinateSystem = EarthMJ2000Eq;
+${name}.DisplayStateType = Keplerian;
+${name}.SMA = ${sma};
+${name}.ECC = ${ecc};
+${name}.INC = ${inclination};
+${name}.RAAN = 0;
+${name}.AOP = 0;
+${name}.TA = ${ta};"""
+
+# État initial cartésien (reprise depuis un checkpoint de fin de phase)
+CARTESIAN_STATE_TEMPLATE = """${name}.DateFormat = TAIModJulian;
+${name}.Epoch = '${epoch}';
+${name}.CoordinateSystem = EarthMJ2000Eq;
+${name}.DisplayStateType = Cartesian;
+${name}.X = ${x};
+${name}.Y = ${y};
+${name}.Z = ${z};
+${name}.VX = ${vx};
+${name}.VY = ${vy};
+${name}.VZ = ${vz};"""
+
+# Phases de la séquence de mission
+MISSION_PHASE_TEMPLATES = {
+    "coast": """
 % PHASE 1: Both objects at target altitude (satellite stays, upper stage will deorbit)
-Propagate Synchronized LEOProp({params['satellite_name'].replace(' ', '_')}) LEOProp(UpperStage) {{{params['satellite_name'].replace(' ', '_')}.ElapsedSecs = 60}};
-
+${propagate}""",
+    "deorbit_burn": """
 % PHASE 2: Upper Stage Eco-Brake Deorbit (satellite continues on orbit)
 
 % Braking maneuver for Upper Stage
 BeginFiniteBurn DeorbitBurn(UpperStage);
-Propagate Synchronized LEOProp({params['satellite_name'].replace(' ', '_')}) LEOProp(UpperStage) {{UpperStage.ElapsedSecs = {burn_duration}}};
-EndFiniteBurn DeorbitBurn(UpperStage);
-
+${propagate}EndFiniteBurn DeorbitBurn(UpperStage);
+""",
+    "descent": """
 % PHASE 3: Upper Stage descent (satellite continues orbiting)
-Propagate Synchronized LEOProp({params['satellite_name'].replace(' ', '_')}) LEOProp(UpperStage) {{UpperStage.ElapsedSecs = 900}};
+${propagate}"""
+}
 
-Toggle SatelliteReport Off;
-Toggle UpperStageReport Off;
+PROPAGATE_TEMPLATE = """Propagate Synchronized LEOProp(${sat}) LEOProp(UpperStage) {${stop_object}.ElapsedSecs = ${stop}};
 """
-        return script
+
+# État des deux objets en fin de phase, écrit dans CheckpointReport
+CHECKPOINT_TEMPLATE = """Report CheckpointReport ${sat}.TAIModJulian ${sat}.ElapsedSecs ${sat}.EarthMJ2000Eq.X ${sat}.EarthMJ2000Eq.Y ${sat}.EarthMJ2000Eq.Z ${sat}.EarthMJ2000Eq.VX ${sat}.EarthMJ2000Eq.VY ${sat}.EarthMJ2000Eq.VZ UpperStage.TAIModJulian UpperStage.ElapsedSecs UpperStage.EarthMJ2000Eq.X UpperStage.EarthMJ2000Eq.Y UpperStage.EarthMJ2000Eq.Z UpperStage.EarthMJ2000Eq.VX UpperStage.EarthMJ2000Eq.VY UpperStage.EarthMJ2000Eq.VZ UpperStage.EcoBrakeFuelTank.FuelMass;
+"""
+
+# Empreinte des templates (modèle de forces, propagateur, colonnes des rapports) :
+# fait partie des clés des phases en cache, qu'une modification des templates invalide
+SCRIPT_TEMPLATES_HASH = hashlib.sha256('\0'.join(
+    [MISSION_SCRIPT_TEMPLATE, KEPLERIAN_STATE_TEMPLATE, CARTESIAN_STATE_TEMPLATE, PROPAGATE_TEMPLATE, CHECKPOINT_TEMPLATE]
+    + [MISSION_PHASE_TEMPLATES[name] for name in sorted(MISSION_PHASE_TEMPLATES)]
+).encode()).hexdigest()[:16]
+
+
+def compile_script_template(text):
+    """
+    Compile un template une seule fois en segments (texte littéral, emplacement) :
+    le rendu ne fait ensuite qu'assembler les segments avec les valeurs.
+    """
+    segments = []
+    literal = ''
+    position = 0
+    for match in Template.pattern.finditer(text):
+        literal += text[position:match.start()]
+        position = match.end()
+        if match.group('escaped') is not None:
+            literal += '$'
+            continue
+        name = match.group('braced') or match.group('named')
+        if name is None:
+            raise ValueError(f"Invalid placeholder in script template at index {match.start()}")
+        segments.append((literal, name))
+        literal = ''
+    segments.append((literal + text[position:], None))
+    return segments
+
+
+class GMATScriptGenerator:
+    """Générateur de scripts GMAT personnalisés"""
+
+    MISSION_SCRIPT = compile_script_template(MISSION_SCRIPT_TEMPLATE)
+    KEPLERIAN_STATE = compile_script_template(KEPLERIAN_STATE_TEMPLATE)
+    CARTESIAN_STATE = compile_script_template(CARTESIAN_STATE_TEMPLATE)
+    PHASES = {name: compile_script_template(text) for name, text in MISSION_PHASE_TEMPLATES.items()}
+    PROPAGATE = compile_script_template(PROPAGATE_TEMPLATE)
+    CHECKPOINT = compile_script_template(CHECKPOINT_TEMPLATE)
+
+    @staticmethod
+    def render(segments, values):
+        """Remplit un template compilé; les valeurs sont converties avec str()"""
+        parts = []
+        for literal, name in segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(str(values[name]))
+        return ''.join(parts)
+
+    @staticmethod
+    def mission_inputs(params):
+        """
+        Valeurs dérivées des paramètres client qui déterminent la simulation
+        (le nom de mission et l'identifiant n'en font pas partie)
+        """
+        # Calculs dérivés
+        sma = 6378 + params['target_altitude']
+
+        # Parse launch date and convert to GMAT format (DD Mon YYYY)
+        launch_date_str = params['launch_date']
+        if 'T' in launch_date_str:
+            # ISO datetime format, extract date only
+            launch_date_str = launch_date_str.split('T')[0]
+
+        # Convert YYYY-MM-DD to DD Mon YYYY format for GMAT
+        try:
+            date_obj = datetime.strptime(launch_date_str, '%Y-%m-%d')
+            launch_date = date_obj.strftime('%d %b %Y')
+        except:
+            # Fallback to original if parsing fails
+            launch_date = launch_date_str
+
+        # Mapping type d'orbite vers inclinaison
+        orbit_inclinations = {
+            "equatorial": 0,
+            "equatorial_dakar": 14.7,
+            "heliosynchronous": 98,
+            "polar": 90,
+            "custom": params.get('custom_inclination', 14.7)
+        }
+        inclination = orbit_inclinations.get(params['orbit_type'], 14.7)
+        
+        # Mapping mode désorbitation vers durée burn
+        deorbit_modes = {
+            "rapid": 300,      # 5 minutes
+            "standard": 120,   # 2 minutes
+            "gentle": 60       # 1 minute
+        }
+        burn_duration = deorbit_modes.get(params['deorbit_mode'], 300)
+        
+        # Calcul masse carburant pour l'étage supérieur
+        # Masse étage = 10% de la masse payload (estimation)
+        upper_stage_mass = max(100.0, params['satellite_mass'] * 10)
+        # Carburant Eco-Brake = 15% de la masse étage
+        upper_stage_fuel = max(15.0, upper_stage_mass * 0.15)
+
+        return {
+            "sat": params['satellite_name'].replace(' ', '_'),
+            "launch_date": launch_date,
+            "sma": sma,
+            "ecc": params.get('eccentricity', 0),
+            "inclination": inclination,
+            "satellite_mass": params['satellite_mass'],
+            "upper_stage_mass": upper_stage_mass,
+            "upper_stage_fuel": upper_stage_fuel,
+            "burn_duration": burn_duration
+        }
+
+    @staticmethod
+    def mission_phases(inputs):
+        """
+        Phases de la séquence : (nom, objet portant la condition d'arrêt, durée en s).
+        GMAT mesure ElapsedSecs d'une condition d'arrêt depuis le début du Propagate.
+        """
+        return [
+            ("coast", inputs['sat'], 60),
+            ("deorbit_burn", "UpperStage", inputs['burn_duration']),
+            ("descent", "UpperStage", 900)
+        ]
+
+    @staticmethod
+    def generate_script(params, mission_id, checkpoint=None, start_phase=0):
+        """
+        Génère un script GMAT à partir des paramètres client.
+        Avec un checkpoint (état en fin de phase start_phase - 1), le script repart
+        de cet état et ne simule que les phases restantes.
+        """
+        inputs = GMATScriptGenerator.mission_inputs(params)
+        render = GMATScriptGenerator.render
+        sat = inputs['sat']
+
+        if checkpoint is None:
+            satellite_state = render(GMATScriptGenerator.KEPLERIAN_STATE, dict(inputs, name=sat, ta=0))
+            upper_stage_state = render(GMATScriptGenerator.KEPLERIAN_STATE, dict(inputs, name='UpperStage', ta=0.1))
+            upper_stage_fuel = inputs['upper_stage_fuel']
+        else:
+            state = checkpoint['state']
+            satellite_state = render(GMATScriptGenerator.CARTESIAN_STATE, dict(state['satellite'], name=sat))
+            upper_stage_state = render(GMATScriptGenerator.CARTESIAN_STATE, dict(state['upper_stage'], name='UpperStage'))
+            upper_stage_fuel = state['upper_stage']['fuel_mass']
+
+        # Séquence : phases restantes, chacune suivie d'un checkpoint
+        sequence = []
+        for name, stop_object, duration in GMATScriptGenerator.mission_phases(inputs)[start_phase:]:
+            propagate = render(GMATScriptGenerator.PROPAGATE, {
+                "sat": sat, "stop_object": stop_object, "stop": duration
+            })
+            sequence.append(render(GMATScriptGenerator.PHASES[name], {"propagate": propagate}))
+            sequence.append(render(GMATScriptGenerator.CHECKPOINT, {"sat": sat}))
+
+        # Remplissage du template compilé (nom du satellite calculé une seule fois)
+        return render(GMATScriptGenerator.MISSION_SCRIPT, dict(
+            inputs,
+            mission_name=params['mission_name'],
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            mission_id=mission_id,
+            satellite_state=satellite_state,
+            upper_stage_state=upper_stage_state,
+            upper_stage_fuel=upper_stage_fuel,
+            mission_sequence=''.join(sequence)
+        ))
 
 
 class GMATResultParser:
     """Parser pour extraire les résultats des fichiers GMAT"""
     
     @staticmethod
-    def parse_report_file(filepath):
-        """Parse un fichier de rapport GMAT"""
-        data = []
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-            if len(lines) < 2:
-                return data
+    def parse_report_line(header, line):
+        """Parse une ligne de données d'un rapport GMAT, ou None si incomplète"""
+        values = line.split()
+        if len(values) < len(header):
+            return None
+
+        # Handle datetime (first column has 4 parts: DD Mon YYYY HH:MM:SS)
+        datetime_val = ' '.join(values[0:4])
+        remaining_values = values[4:]
+
+        row = {header[0]: datetime_val}
+        for i, val in enumerate(remaining_values):
+            if i + 1 < len(header):
+                row[header[i + 1]] = val
+        return row
 
+    @staticmethod
+    def iter_report_rows(filepath):
+        """Parcourt un fichier de rapport GMAT ligne par ligne (mémoire constante)"""
+        with open(filepath, 'r') as f:
             # Parse header manually (space-separated, fixed width)
-            header = lines[0].split()
+            header = f.readline().split()
+            if not header:
+                return
 
-            # Parse data lines
-            for line in lines[1:]:
-                values = line.split()
-                if len(values) >= len(header):
-                    # Handle datetime (first column has 4 parts: DD Mon YYYY HH:MM:SS)
-                    datetime_val = ' '.join(values[0:4])
-                    remaining_values = values[4:]
-
-                    row = {header[0]: datetime_val}
-                    for i, val in enumerate(remaining_values):
-                        if i + 1 < len(header):
-                            row[header[i + 1]] = val
-
-                    data.append(row)
-        return data
+            for line in f:
+                row = GMATResultParser.parse_report_line(header, line)
+                if row is not None:
+                    yield row
+
+    @staticmethod
+    def read_report_header(filepath):
+        with open(filepath, 'r') as f:
+            return f.readline().split()
+
+    @staticmethod
+    def read_last_row(filepath, block_size=4096):
+        """Lit la dernière ligne de données en partant de la fin du fichier"""
+        header = GMATResultParser.read_report_header(filepath)
+        with open(filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b''
+            while position > 0:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                tail = f.read(read_size) + tail
+                lines = tail.splitlines()
+                # La première ligne du bloc peut être tronquée, sauf en début de fichier
+                candidates = lines if position == 0 else lines[1:]
+                for line in reversed(candidates):
+                    row = GMATResultParser.parse_report_line(header, line.decode())
+                    if row is not None:
+                        return row
+        return None
+
+    @staticmethod
+    def parse_report_file(filepath):
+        """Parse un fichier de rapport GMAT"""
+        return list(GMATResultParser.iter_report_rows(filepath))
     
     @staticmethod
     def extract_metrics(satellite_data, upperstage_data):
@@ -431,6 +817,239 @@ class GMATResultParser:
         }
 
 
+class EphemerisExporter:
+    """
+    Conversion en flux d'un rapport GMAT satellite vers CCSDS OEM, CSV ou JSONL.
+    Tout est fait par générateurs : la mémoire reste constante quelle que soit
+    la taille du rapport.
+    """
+
+    FORMATS = {
+        "oem": ("text/plain", "oem"),
+        "csv": ("text/csv", "csv"),
+        "jsonl": ("application/x-ndjson", "jsonl")
+    }
+    CHUNK_SIZE = 64 * 1024
+    # Pas de rééchantillonnage minimal (s) : borne la taille de l'export
+    MIN_STEP = 0.1
+
+    @staticmethod
+    def resolve_columns(header):
+        """Associe les colonnes du rapport (UTCGregorian, ElapsedSecs, X..VZ) à leur nom complet"""
+        columns = {}
+        for name in header:
+            for key, suffix in (("epoch", ".UTCGregorian"), ("elapsed", ".ElapsedSecs"),
+                                ("x", ".EarthMJ2000Eq.X"), ("y", ".EarthMJ2000Eq.Y"),
+                                ("z", ".EarthMJ2000Eq.Z"), ("vx", ".EarthMJ2000Eq.VX"),
+                                ("vy", ".EarthMJ2000Eq.VY"), ("vz", ".EarthMJ2000Eq.VZ")):
+                if name.endswith(suffix):
+                    columns[key] = name
+        columns['object_name'] = header[0].split('.')[0] if header else ''
+        columns['has_position'] = all(k in columns for k in ("x", "y", "z"))
+        return columns
+
+    MONTHS = {m: i + 1 for i, m in enumerate(
+        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])}
+
+    @staticmethod
+    def parse_epoch(value):
+        """Parse une date UTCGregorian GMAT (DD Mon YYYY HH:MM:SS.sss), sans strptime (trop lent par ligne)"""
+        day, month, year, clock = value.split()
+        hours, minutes, seconds = clock.split(':')
+        return datetime(int(year), EphemerisExporter.MONTHS[month], int(day)) + timedelta(
+            hours=int(hours), minutes=int(minutes), seconds=float(seconds))
+
+    @staticmethod
+    def format_epoch(epoch):
+        return epoch.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+    @staticmethod
+    def row_to_state(row, columns):
+        """Convertit une ligne du rapport en état (epoch, elapsed, position, vitesse)"""
+        position = None
+        if columns['has_position']:
+            position = tuple(float(row[columns[k]]) for k in ("x", "y", "z"))
+        velocity = tuple(float(row[columns[k]]) for k in ("vx", "vy", "vz"))
+        return (
+            EphemerisExporter.parse_epoch(row[columns['epoch']]),
+            float(row[columns['elapsed']]),
+            position,
+            velocity
+        )
+
+    @staticmethod
+    def iter_states(report_path, columns):
+        for row in GMATResultParser.iter_report_rows(report_path):
+            yield EphemerisExporter.row_to_state(row, columns)
+
+    @staticmethod
+    def strictly_increasing(states):
+        """
+        Supprime les états qui n'avancent pas dans le temps : GMAT répète l'état de
+        frontière au début de chaque Propagate, et un bloc OEM exige des époques croissantes
+        """
+        previous_elapsed = None
+        for state in states:
+            if previous_elapsed is None or state[1] > previous_elapsed:
+                previous_elapsed = state[1]
+                yield state
+
+    @staticmethod
+    def interpolate(state_a, state_b, elapsed):
+        """
+        Interpolation entre deux états : Hermite cubique pour la position
+        (les vitesses sont les dérivées), linéaire pour la vitesse.
+        """
+        epoch_a, t_a, pos_a, vel_a = state_a
+        _, t_b, pos_b, vel_b = state_b
+        h = t_b - t_a
+        s = (elapsed - t_a) / h
+
+        velocity = tuple(va + s * (vb - va) for va, vb in zip(vel_a, vel_b))
+        position = None
+        if pos_a is not None:
+            h00 = 2 * s**3 - 3 * s**2 + 1
+            h10 = s**3 - 2 * s**2 + s
+            h01 = -2 * s**3 + 3 * s**2
+            h11 = s**3 - s**2
+            position = tuple(
+                h00 * pa + h10 * h * va + h01 * pb + h11 * h * vb
+                for pa, va, pb, vb in zip(pos_a, vel_a, pos_b, vel_b)
+            )
+        epoch = epoch_a + timedelta(seconds=elapsed - t_a)
+        return (epoch, elapsed, position, velocity)
+
+    @staticmethod
+    def resample(states, step):
+        """Rééchantillonne un flux d'états à pas fixe (secondes)"""
+        previous = None
+        start = None
+        index = 0
+        for state in states:
+            if previous is None:
+                previous = state
+                start = state[1]
+                continue
+
+            # Segments de durée nulle (fins de Propagate) : on garde le dernier état
+            if state[1] > previous[1]:
+                while start + index * step < state[1]:
+                    yield EphemerisExporter.interpolate(previous, state, start + index * step)
+                    index += 1
+            previous = state
+
+        if previous is not None and abs(start + index * step - previous[1]) < 1e-9:
+            yield previous
+
+    @staticmethod
+    def oem_lines(states, columns, start_epoch, stop_epoch, mission_id):
+        """Fichier CCSDS OEM 2.0 (KVN)"""
+        yield "CCSDS_OEM_VERS = 2.0\n"
+        yield f"CREATION_DATE = {EphemerisExporter.format_epoch(datetime.now(timezone.utc))}\n"
+        yield "ORIGINATOR = AFREELEO\n\n"
+        yield "META_START\n"
+        yield f"OBJECT_NAME = {columns['object_name']}\n"
+        yield f"OBJECT_ID = {mission_id}\n"
+        yield "CENTER_NAME = EARTH\n"
+        yield "REF_FRAME = EME2000\n"
+        yield "TIME_SYSTEM = UTC\n"
+        yield f"START_TIME = {EphemerisExporter.format_epoch(start_epoch)}\n"
+        yield f"STOP_TIME = {EphemerisExporter.format_epoch(stop_epoch)}\n"
+        yield "META_STOP\n\n"
+        for epoch, _, position, velocity in states:
+            values = ' '.join(f'{v:.9f}' for v in position + velocity)
+            yield f"{EphemerisExporter.format_epoch(epoch)} {values}\n"
+
+    @staticmethod
+    def csv_lines(states, columns):
+        fields = ['epoch_utc', 'elapsed_s']
+        if columns['has_position']:
+            fields += ['x_km', 'y_km', 'z_km']
+        fields += ['vx_km_s', 'vy_km_s', 'vz_km_s']
+        yield ','.join(fields) + '\n'
+        for epoch, elapsed, position, velocity in states:
+            values = [EphemerisExporter.format_epoch(epoch), repr(elapsed)]
+            values += [repr(v) for v in (position or ()) + velocity]
+            yield ','.join(values) + '\n'
+
+    @staticmethod
+    def jsonl_lines(states, columns):
+        for epoch, elapsed, position, velocity in states:
+            record = {"epoch_utc": EphemerisExporter.format_epoch(epoch), "elapsed_s": elapsed}
+            if position is not None:
+                record["position_km"] = list(position)
+            record["velocity_km_s"] = list(velocity)
+            yield json.dumps(record) + '\n'
+
+    @staticmethod
+    def chunked(lines, chunk_size=CHUNK_SIZE):
+        """Regroupe les lignes en blocs d'environ chunk_size octets"""
+        buffer = []
+        size = 0
+        for line in lines:
+            data = line.encode()
+            buffer.append(data)
+            size += len(data)
+            if size >= chunk_size:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b''.join(buffer)
+
+    @staticmethod
+    def gzip_stream(chunks):
+        """Compression gzip à la volée"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def export(report_path, export_format, mission_id, step=None, compress=False):
+        """
+        Construit le générateur d'export. Lève ValueError si le format est inconnu
+        ou si le rapport ne contient pas les colonnes nécessaires.
+        """
+        if export_format not in EphemerisExporter.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        columns = EphemerisExporter.resolve_columns(GMATResultParser.read_report_header(report_path))
+        missing = [k for k in ("epoch", "elapsed", "vx", "vy", "vz") if k not in columns]
+        if missing:
+            raise ValueError(f"Report is missing required columns: {', '.join(missing)}")
+        if export_format == "oem" and not columns['has_position']:
+            raise ValueError("OEM export requires position columns (X, Y, Z); re-run the mission to include them")
+
+        states = EphemerisExporter.strictly_increasing(EphemerisExporter.iter_states(report_path, columns))
+        if step:
+            states = EphemerisExporter.resample(states, step)
+
+        if export_format == "oem":
+            first_state = next(EphemerisExporter.iter_states(report_path, columns), None)
+            last_row = GMATResultParser.read_last_row(report_path)
+            if first_state is None or last_row is None:
+                raise ValueError("Report contains no data")
+            last_state = EphemerisExporter.row_to_state(last_row, columns)
+            stop_epoch = last_state[0]
+            if step:
+                # Dernier instant atteint par la grille de rééchantillonnage
+                span = last_state[1] - first_state[1]
+                stop_epoch = first_state[0] + timedelta(seconds=math.floor(span / step) * step)
+            lines = EphemerisExporter.oem_lines(states, columns, first_state[0], stop_epoch, mission_id)
+        elif export_format == "csv":
+            lines = EphemerisExporter.csv_lines(states, columns)
+        else:
+            lines = EphemerisExporter.jsonl_lines(states, columns)
+
+        chunks = EphemerisExporter.chunked(lines)
+        if compress:
+            chunks = EphemerisExporter.gzip_stream(chunks)
+        return chunks
+
+
 class CostCalculator:
     """Cost calculator for missions"""
 
@@ -487,53 +1106,307 @@ class CostCalculator:
         }
 
 
-@app.route('/api/calculate-mission', methods=['POST'])
-def calculate_mission():
+class GMATSandbox:
     """
-    Endpoint principal pour calculer une mission
+    Bac à sable GMAT préparé une fois par processus (API ou worker).
+
+    Les fichiers de données lus à chaque exécution (JGM2.cof, SpaceWeather, Schatten,
+    éphémérides planétaires...) sont copiés sur un stockage local rapide (tmpfs par
+    défaut), et un fichier de démarrage dédié pointe GMAT vers ces copies, vers un
+    dossier output local et désactive les plugins inutiles en console.
     """
-    try:
-        # Récupérer les données du formulaire
-        params = request.json
-        
-        # Validation basique
-        required_fields = ['mission_name', 'satellite_name', 'satellite_mass', 
-                          'target_altitude', 'orbit_type', 'launch_date', 'deorbit_mode']
-        for field in required_fields:
-            if field not in params:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        # Validation des ranges
-        if not (1 <= params['satellite_mass'] <= 50):
-            return jsonify({"error": "Satellite mass must be between 1 and 50 kg"}), 400
-        
-        if not (300 <= params['target_altitude'] <= 800):
-            return jsonify({"error": "Target altitude must be between 300 and 800 km"}), 400
-        
-        # Générer un ID unique pour cette mission
-        mission_id = str(uuid.uuid4())[:8]
-        mission_dir = MISSIONS_DIR / mission_id
-        mission_dir.mkdir(exist_ok=True)
-        
-        # Sauvegarder les paramètres d'entrée
-        with open(mission_dir / 'input.json', 'w') as f:
-            json.dump(params, f, indent=2)
-        
-        # Générer le script GMAT
-        script_content = GMATScriptGenerator.generate_script(params, mission_id)
+
+    # Processus propriétaire (hostname, pid), pour supprimer les bacs à sable orphelins
+    OWNER_FILE = 'owner.json'
+
+    def __init__(self, name, root=None):
+        self.path = Path(root or get_config().sandbox_root) / name
+        self.data_dir = self.path / 'data'
+        self.output_dir = self.path / 'output'
+        self.startup_file = self.path / 'gmat_startup_file.txt'
+
+    @staticmethod
+    def copy_if_changed(src, dst):
+        """copy2 sauf si la copie existante a même taille et même date"""
+        if os.path.exists(dst):
+            src_stat, dst_stat = os.stat(src), os.stat(dst)
+            if src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+                return dst
+        return shutil.copy2(src, dst)
+
+    def mirror(self, source, target, relative=''):
+        """
+        Reproduit source dans target : les chemins de sandbox.staged_data sont copiés,
+        tout le reste est un lien symbolique vers l'installation GMAT.
+        """
+        staged_data = get_config().sandbox_staged_data
+        target.mkdir(parents=True, exist_ok=True)
+        for entry in source.iterdir():
+            entry_relative = f'{relative}{entry.name}'
+            destination = target / entry.name
+            if entry_relative in staged_data:
+                if entry.is_dir():
+                    shutil.copytree(entry, destination, dirs_exist_ok=True, copy_function=self.copy_if_changed)
+                else:
+                    self.copy_if_changed(entry, destination)
+            elif entry.is_dir() and any(p.startswith(entry_relative + '/') for p in staged_data):
+                self.mirror(entry, destination, entry_relative + '/')
+            elif not destination.exists() and not destination.is_symlink():
+                destination.symlink_to(entry.resolve())
+
+    def write_startup_file(self):
+        """
+        Fichier de démarrage dérivé de celui de l'installation : chemins absolus,
+        DATA_PATH et OUTPUT_PATH vers le bac à sable, plugins inutiles commentés.
+        """
+        config = get_config()
+        bin_dir = Path(config.gmat_bin_dir).resolve()
+        overrides = {
+            'ROOT_PATH': f'{bin_dir.parent}/',
+            'DATA_PATH': f'{self.data_dir}/',
+            'OUTPUT_PATH': f'{self.output_dir}/',
+            'LOG_FILE': f'{self.output_dir}/GmatLog.txt'
+        }
+
+        install_startup_file = bin_dir / 'gmat_startup_file.txt'
+        lines = []
+        if install_startup_file.exists():
+            with open(install_startup_file, 'r') as f:
+                lines = f.read().splitlines()
+
+        startup = []
+        for line in lines:
+            key, _, value = line.partition('=')
+            key, value = key.strip(), value.strip()
+            if key.startswith('#') or not value:
+                startup.append(line)
+            elif key in overrides:
+                startup.append(f'{key:<27}= {overrides.pop(key)}')
+            elif key == 'PLUGIN' and any(p.lower() in value.lower() for p in config.sandbox_disabled_plugins):
+                startup.append(f'# {line}  (disabled in AFREELEO sandbox)')
+            elif value.startswith('./') or value.startswith('../'):
+                # Les chemins relatifs de l'installation sont relatifs au dossier bin
+                startup.append(f'{key:<27}= {(bin_dir / value).resolve()}{"/" if value.endswith("/") else ""}')
+            else:
+                startup.append(line)
+        # Clés absentes du fichier de l'installation (ou installation sans fichier)
+        startup += [f'{key:<27}= {value}' for key, value in overrides.items()]
+
+        with open(self.startup_file, 'w') as f:
+            f.write('\n'.join(startup) + '\n')
+
+    @staticmethod
+    def process_alive(pid):
+        """Vrai si un processus de cette machine porte ce PID (toujours vrai sous Windows)"""
+        if os.name == 'nt' or not isinstance(pid, int):
+            # os.kill(pid, 0) terminerait le processus sous Windows
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def remove_stale_sandboxes(self):
+        """
+        Supprime les bacs à sable laissés par les processus morts de cette machine
+        (tués par SIGKILL : la suppression à la sortie n'a pas eu lieu)
+        """
+        hostname = socket.gethostname()
+        for path in self.path.parent.iterdir():
+            if path == self.path:
+                continue
+            try:
+                with open(path / self.OWNER_FILE, 'r') as f:
+                    owner = json.load(f)
+            except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+                continue
+            if owner.get('hostname') == hostname and not self.process_alive(owner.get('pid')):
+                print(f"[INFO] Removing stale GMAT sandbox {path} (process {owner.get('pid')} is gone)")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def prepare(self):
+        start = time.perf_counter()
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.path / self.OWNER_FILE, {"hostname": socket.gethostname(), "pid": os.getpid()})
+        self.remove_stale_sandboxes()
+        gmat_data_dir = get_config().gmat_data_dir
+        if gmat_data_dir.is_dir():
+            self.mirror(gmat_data_dir.resolve(), self.data_dir)
+        else:
+            print(f"[WARNING] GMAT data directory not found: {gmat_data_dir}")
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.write_startup_file()
+        print(f"[INFO] GMAT sandbox ready in {self.path} ({time.perf_counter() - start:.2f}s)")
+        return self
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def command(self, script_path):
+        return [get_config().gmat_path, '--startup_file', str(self.startup_file), '-r', str(script_path)]
+
+
+gmat_sandbox = None
+gmat_sandbox_lock = threading.Lock()
+
+
+def get_gmat_sandbox(name=None):
+    """Bac à sable de ce processus, préparé au premier appel et supprimé à la sortie"""
+    global gmat_sandbox
+    with gmat_sandbox_lock:
+        if gmat_sandbox is None:
+            gmat_sandbox = GMATSandbox(name or f"{socket.gethostname()}-{os.getpid()}").prepare()
+            atexit.register(gmat_sandbox.cleanup)
+        return gmat_sandbox
+
+
+class PhaseCheckpointStore:
+    """
+    Cache des frontières de phases de la séquence de mission.
+
+    Chaque entrée correspond à une phase terminée : état des deux objets en fin de
+    phase (époque TAI, état cartésien EarthMJ2000Eq, carburant) et lignes des rapports
+    produites pendant la phase. La clé d'une phase dépend des entrées de simulation et
+    de toutes les phases précédentes : deux missions qui partagent un préfixe de
+    phases partagent les mêmes clés pour ce préfixe.
+    """
+
+    # Entrées qui n'agissent que via les durées de phase (déjà dans la clé de chaque phase)
+    PHASE_INPUTS = ('burn_duration',)
+    # Format des entrées (découpage des lignes par phase) : à incrémenter s'il change
+    FORMAT_VERSION = 2
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def phase_keys(inputs, phases):
+        keys = []
+        shared = {k: v for k, v in inputs.items() if k not in PhaseCheckpointStore.PHASE_INPUTS}
+        previous = (f'{PhaseCheckpointStore.FORMAT_VERSION}|{SCRIPT_TEMPLATES_HASH}|'
+                    f'{json.dumps(shared, sort_keys=True)}')
+        for name, stop_object, duration in phases:
+            previous = hashlib.sha256(f'{previous}|{name}|{stop_object}|{duration}'.encode()).hexdigest()[:24]
+            keys.append(previous)
+        return keys
+
+    def load(self, key):
+        try:
+            with open(self.root / f'{key}.json', 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, entry):
+        write_json_atomic(self.root / f'{key}.json', entry)
+
+
+class PhasedMissionRunner:
+    """
+    Exécution incrémentale d'une mission : les phases déjà simulées pour les mêmes
+    entrées sont reprises du cache, GMAT ne simule que les phases restantes à partir
+    de l'état du dernier checkpoint, puis les segments de rapport sont recollés.
+    """
+
+    # Tolérance (s) pour rattacher une ligne de rapport à la fin d'une phase
+    ELAPSED_TOLERANCE = 1e-3
+
+    @staticmethod
+    def format_report_line(column_starts, cells):
+        """Aligne les cellules sur les colonnes de l'en-tête (FixedWidth, LeftJustify)"""
+        parts = []
+        for i, cell in enumerate(cells[:-1]):
+            width = column_starts[i + 1] - column_starts[i]
+            parts.append(cell + ' ' * max(1, width - len(cell)))
+        parts.append(cells[-1])
+        return ''.join(parts)
+
+    @staticmethod
+    def read_report(report_path, offset):
+        """
+        Lit un rapport GMAT produit par un script repris à ElapsedSecs = offset :
+        retourne l'en-tête et les lignes (elapsed absolu, ligne réécrite).
+        """
+        with open(report_path, 'r') as f:
+            header = f.readline().rstrip('\n')
+            names = header.split()
+            column_starts = [m.start() for m in re.finditer(r'\S+', header)]
+            elapsed_index = next(i for i, name in enumerate(names) if name.endswith('.ElapsedSecs'))
+
+            rows = []
+            for line in f:
+                values = line.split()
+                if len(values) < len(names):
+                    continue
+                cells = [' '.join(values[0:4])] + values[4:]
+                elapsed = float(cells[elapsed_index]) + offset
+                if offset:
+                    cells[elapsed_index] = f'{elapsed:.16g}'
+                    line = PhasedMissionRunner.format_report_line(column_starts, cells)
+                rows.append((elapsed, line.rstrip('\n')))
+        return header, rows
+
+    @staticmethod
+    def phase_row_count(rows, end_elapsed):
+        """
+        Nombre de lignes (en tête de rows) appartenant à une phase qui se termine à
+        end_elapsed : celles d'avant la fin, plus la première ligne de fin. La ligne
+        suivante au même instant est l'état de frontière répété par GMAT au début du
+        Propagate suivant : elle appartient à la phase suivante.
+        """
+        limit = end_elapsed - PhasedMissionRunner.ELAPSED_TOLERANCE
+        for count, (elapsed, line) in enumerate(rows):
+            if elapsed >= limit:
+                return count + 1
+        return len(rows)
+
+    @staticmethod
+    def read_checkpoints(checkpoint_path, offset):
+        """États écrits par les commandes Report CheckpointReport (une ligne par phase)"""
+        states = []
+        with open(checkpoint_path, 'r') as f:
+            for line in f:
+                values = [float(v) for v in line.split()]
+                if len(values) < 17:
+                    continue
+                keys = ("epoch", "elapsed", "x", "y", "z", "vx", "vy", "vz")
+                satellite = dict(zip(keys, values[0:8]))
+                upper_stage = dict(zip(keys, values[8:16]), fuel_mass=values[16])
+                states.append({
+                    "elapsed": satellite.pop('elapsed') + offset,
+                    "satellite": satellite,
+                    "upper_stage": {k: v for k, v in upper_stage.items() if k != 'elapsed'}
+                })
+        return states
+
+    @staticmethod
+    def run_gmat(params, mission_id, mission_dir, checkpoint, start_phase):
+        """Exécute GMAT pour les phases restantes; retourne (dossier output, None) ou (None, (erreur, status))"""
         script_path = mission_dir / f'mission_{mission_id}.script'
-        
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-        
+        if start_phase > 0:
+            # Script de reprise, distinct du script complet de référence
+            script_path = mission_dir / f'mission_{mission_id}_resume.script'
+            with open(script_path, 'w') as f:
+                f.write(GMATScriptGenerator.generate_script(params, mission_id, checkpoint, start_phase))
+
+        # Bac à sable préparé (données sur stockage rapide) ou installation GMAT directe
+        config = get_config()
+        sandbox = get_gmat_sandbox() if config.sandbox_enabled else None
+        gmat_output_dir = sandbox.output_dir if sandbox else config.gmat_output_dir
+
         # Exécuter GMAT
         try:
             # Convertir en chemin absolu
             script_path_abs = script_path.resolve()
 
-            print(f"[INFO] Starting GMAT execution for mission {mission_id}...")
+            print(f"[INFO] Starting GMAT execution for mission {mission_id} (from phase {start_phase + 1})...")
             result = subprocess.run(
-                [GMAT_PATH, '-r', str(script_path_abs)],
+                sandbox.command(script_path_abs) if sandbox else [config.gmat_path, '-r', str(script_path_abs)],
                 capture_output=True,
                 text=True,
                 timeout=600,  # 10 minutes timeout pour les simulations
@@ -543,149 +1416,771 @@ def calculate_mission():
 
             if result.returncode != 0:
                 print(f"[ERROR] GMAT stderr: {result.stderr}")
-                return jsonify({
+                return None, ({
                     "error": "GMAT execution failed",
                     "details": result.stderr
-                }), 500
+                }, 500)
 
         except subprocess.TimeoutExpired:
             print(f"[ERROR] GMAT execution timeout after 600 seconds")
-            return jsonify({"error": "GMAT execution timeout (exceeded 10 minutes)"}), 500
+            return None, ({"error": "GMAT execution timeout (exceeded 10 minutes)"}, 500)
 
         except Exception as e:
             print(f"[ERROR] GMAT execution error: {str(e)}")
-            return jsonify({"error": f"GMAT execution error: {str(e)}"}), 500
-
-        # Parser les résultats depuis le dossier output de GMAT
-        satellite_report_path = GMAT_OUTPUT_DIR / f'mission_{mission_id}_satellite.txt'
-        upperstage_report_path = GMAT_OUTPUT_DIR / f'mission_{mission_id}_upperstage.txt'
-
-        if not satellite_report_path.exists() or not upperstage_report_path.exists():
-            return jsonify({
-                "error": "GMAT report files not generated",
-                "expected_paths": {
-                    "satellite_report": str(satellite_report_path),
-                    "upperstage_report": str(upperstage_report_path)
-                }
-            }), 500
-
-        # Copier les fichiers de sortie GMAT vers le dossier de mission
-        try:
-            mission_satellite_report = mission_dir / f'mission_{mission_id}_satellite.txt'
-            mission_upperstage_report = mission_dir / f'mission_{mission_id}_upperstage.txt'
+            return None, ({"error": f"GMAT execution error: {str(e)}"}, 500)
 
-            shutil.copy2(satellite_report_path, mission_satellite_report)
-            shutil.copy2(upperstage_report_path, mission_upperstage_report)
+        return gmat_output_dir, None
 
-            print(f"[INFO] Copied GMAT output files to mission directory: {mission_dir}")
+    @staticmethod
+    def run(params, mission_id, mission_dir, owns_mission=None):
+        """
+        Simule la mission et écrit les rapports complets dans mission_dir.
+        Retourne ({"reused_phases", "simulated_phases"}, 200) ou (erreur, status).
+        owns_mission : voir execute_mission.
+        """
+        inputs = GMATScriptGenerator.mission_inputs(params)
+        phases = GMATScriptGenerator.mission_phases(inputs)
+        keys = PhaseCheckpointStore.phase_keys(inputs, phases)
+
+        # Plus long préfixe de phases déjà en cache
+        cached = []
+        for key in keys:
+            entry = get_checkpoint_store().load(key)
+            if entry is None:
+                break
+            cached.append(entry)
+        start_phase = len(cached)
+        checkpoint = cached[-1] if cached else None
+
+        segments = {
+            "satellite": [row for entry in cached for row in entry['satellite_rows']],
+            "upperstage": [row for entry in cached for row in entry['upperstage_rows']]
+        }
+        headers = {
+            "satellite": checkpoint['satellite_header'] if checkpoint else None,
+            "upperstage": checkpoint['upperstage_header'] if checkpoint else None
+        }
 
-            # Utiliser les fichiers copiés pour le parsing
-            satellite_report_path = mission_satellite_report
-            upperstage_report_path = mission_upperstage_report
-        except Exception as e:
-            print(f"[WARNING] Failed to copy GMAT output files: {str(e)}")
-            # Continue avec les fichiers originaux si la copie échoue
+        if start_phase < len(phases):
+            gmat_output_dir, error = PhasedMissionRunner.run_gmat(params, mission_id, mission_dir, checkpoint, start_phase)
+            if error:
+                return error
 
-        try:
-            satellite_data = GMATResultParser.parse_report_file(satellite_report_path)
-            upperstage_data = GMATResultParser.parse_report_file(upperstage_report_path)
-        except Exception as e:
-            return jsonify({
-                "error": "Failed to parse GMAT report files",
-                "details": str(e)
-            }), 500
+            # Parser les résultats depuis le dossier output de GMAT
+            report_paths = {
+                name: gmat_output_dir / f'mission_{mission_id}_{name}.txt' for name in ("satellite", "upperstage")
+            }
+            checkpoint_path = gmat_output_dir / f'mission_{mission_id}_checkpoints.txt'
+
+            if not all(path.exists() for path in report_paths.values()):
+                return {
+                    "error": "GMAT report files not generated",
+                    "expected_paths": {
+                        "satellite_report": str(report_paths['satellite']),
+                        "upperstage_report": str(report_paths['upperstage'])
+                    }
+                }, 500
+
+            offset = checkpoint['state']['elapsed'] if checkpoint else 0
+            new_rows = {}
+            for name, path in report_paths.items():
+                headers[name], new_rows[name] = PhasedMissionRunner.read_report(path, offset)
+            states = []
+            if checkpoint_path.exists():
+                states = PhasedMissionRunner.read_checkpoints(checkpoint_path, offset)
+
+            # Découper les nouvelles lignes par phase et enregistrer les checkpoints
+            remaining_phases = phases[start_phase:]
+            if len(states) == len(remaining_phases):
+                for i, (phase, state) in enumerate(zip(remaining_phases, states)):
+                    is_last = i == len(states) - 1
+                    entry = {
+                        "phase": phase[0],
+                        "state": state,
+                        "satellite_header": headers['satellite'],
+                        "upperstage_header": headers['upperstage']
+                    }
+                    for name in ("satellite", "upperstage"):
+                        if is_last:
+                            count = len(new_rows[name])
+                        else:
+                            count = PhasedMissionRunner.phase_row_count(new_rows[name], state['elapsed'])
+                        entry[f'{name}_rows'] = [line for elapsed, line in new_rows[name][:count]]
+                        new_rows[name] = new_rows[name][count:]
+                        segments[name] += entry[f'{name}_rows']
+                    get_checkpoint_store().save(keys[start_phase + i], entry)
+            else:
+                print(f"[WARNING] Expected {len(remaining_phases)} checkpoints, got {len(states)}: phases not cached")
+                for name in ("satellite", "upperstage"):
+                    segments[name] += [line for elapsed, line in new_rows[name]]
+
+            # Les sorties GMAT sont recopiées (recollées) dans le dossier de mission
+            for path in list(report_paths.values()) + [checkpoint_path]:
+                path.unlink(missing_ok=True)
+
+        if owns_mission and not owns_mission():
+            return lease_lost_error(mission_id)
+
+        # Rapports complets : segments en cache + segments simulés
+        for name in ("satellite", "upperstage"):
+            with open(mission_dir / f'mission_{mission_id}_{name}.txt', 'w') as f:
+                f.write(headers[name] + '\n')
+                for line in segments[name]:
+                    f.write(line + '\n')
+        print(f"[INFO] Mission {mission_id}: {start_phase} phase(s) reused, "
+              f"{len(phases) - start_phase} simulated, reports written to {mission_dir}")
 
-        # Extraire les métriques
-        try:
-            metrics = GMATResultParser.extract_metrics(satellite_data, upperstage_data)
-        except Exception as e:
-            return jsonify({
-                "error": "Failed to extract metrics from GMAT data",
-                "details": str(e),
-                "data_length": {"satellite": len(satellite_data), "upperstage": len(upperstage_data)}
-            }), 500
-        
-        # Calculer les coûts
-        costs = CostCalculator.calculate_costs(params, metrics)
-        
-        # Préparer les données de trajectoire pour visualisation
-        # Détecter le nom du satellite dynamiquement
-        if satellite_data:
-            sample_key = list(satellite_data[0].keys())[0]
-            satellite_name = sample_key.split('.')[0]
-        else:
-            satellite_name = params['satellite_name'].replace(' ', '_')
-
-        # Trajectoire du satellite
-        satellite_trajectory = []
-        for i in range(0, len(satellite_data), 10):  # Sample tous les 10 points
-            row = satellite_data[i]
-            satellite_trajectory.append({
-                "time": row.get(f'{satellite_name}.UTCGregorian', ''),
-                "latitude": float(row.get(f'{satellite_name}.Earth.Latitude', 0)),
-                "longitude": float(row.get(f'{satellite_name}.Earth.Longitude', 0)),
-                "altitude": float(row.get(f'{satellite_name}.Earth.Altitude', 0))
-            })
+        return {
+            "reused_phases": [name for name, _, _ in phases[:start_phase]],
+            "simulated_phases": [name for name, _, _ in phases[start_phase:]]
+        }, 200
 
-        # Trajectoire de l'étage supérieur (descente)
-        upperstage_trajectory = []
-        for i in range(0, len(upperstage_data), 5):  # Plus de points pour voir la descente
-            row = upperstage_data[i]
-            upperstage_trajectory.append({
-                "time": row.get('UpperStage.UTCGregorian', ''),
-                "altitude": float(row.get('UpperStage.Earth.Altitude', 0))
-            })
 
-        # Construire la réponse complète
-        response = {
-            "success": True,
+_checkpoint_store = None
+
+
+def get_checkpoint_store():
+    """Cache des checkpoints de phases, créé au premier usage"""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        _checkpoint_store = PhaseCheckpointStore(get_config().checkpoints_dir)
+    return _checkpoint_store
+
+
+def lease_lost_error(mission_id):
+    """Réponse d'un worker qui a perdu le bail d'une mission (réclamée par un autre)"""
+    return {"error": "Mission lease lost", "mission_id": mission_id}, 409
+
+
+def execute_mission(params, mission_id, owns_mission=None):
+    """
+    Génère le script, exécute GMAT et construit la réponse d'une mission.
+    Retourne un tuple (payload, status_code), utilisé par l'API et par les workers.
+    owns_mission : fonction appelée avant d'écrire dans le dossier de mission ; si
+    elle retourne False (bail perdu par le worker), rien n'est écrit.
+    """
+    mission_dir = get_config().missions_dir / mission_id
+    mission_dir.mkdir(parents=True, exist_ok=True)
+
+    # Script complet de la mission (référence téléchargeable, même si des phases viennent du cache)
+    script_content = GMATScriptGenerator.generate_script(params, mission_id)
+    script_path = mission_dir / f'mission_{mission_id}.script'
+    
+    with open(script_path, 'w') as f:
+        f.write(script_content)
+
+    # Exécuter GMAT à partir du dernier checkpoint de phase disponible
+    simulation, status = PhasedMissionRunner.run(params, mission_id, mission_dir, owns_mission)
+    if status != 200:
+        return simulation, status
+
+    satellite_report_path = mission_dir / f'mission_{mission_id}_satellite.txt'
+    upperstage_report_path = mission_dir / f'mission_{mission_id}_upperstage.txt'
+
+    try:
+        satellite_data = GMATResultParser.parse_report_file(satellite_report_path)
+        upperstage_data = GMATResultParser.parse_report_file(upperstage_report_path)
+    except Exception as e:
+        return {
+            "error": "Failed to parse GMAT report files",
+            "details": str(e)
+        }, 500
+
+    # Extraire les métriques
+    try:
+        metrics = GMATResultParser.extract_metrics(satellite_data, upperstage_data)
+    except Exception as e:
+        return {
+            "error": "Failed to extract metrics from GMAT data",
+            "details": str(e),
+            "data_length": {"satellite": len(satellite_data), "upperstage": len(upperstage_data)}
+        }, 500
+    
+    # Calculer les coûts
+    costs = CostCalculator.calculate_costs(params, metrics)
+    
+    # Préparer les données de trajectoire pour visualisation
+    # Détecter le nom du satellite dynamiquement
+    if satellite_data:
+        sample_key = list(satellite_data[0].keys())[0]
+        satellite_name = sample_key.split('.')[0]
+    else:
+        satellite_name = params['satellite_name'].replace(' ', '_')
+
+    # Trajectoire du satellite
+    satellite_trajectory = []
+    for i in range(0, len(satellite_data), 10):  # Sample tous les 10 points
+        row = satellite_data[i]
+        satellite_trajectory.append({
+            "time": row.get(f'{satellite_name}.UTCGregorian', ''),
+            "latitude": float(row.get(f'{satellite_name}.Earth.Latitude', 0)),
+            "longitude": float(row.get(f'{satellite_name}.Earth.Longitude', 0)),
+            "altitude": float(row.get(f'{satellite_name}.Earth.Altitude', 0))
+        })
+
+    # Trajectoire de l'étage supérieur (descente)
+    upperstage_trajectory = []
+    for i in range(0, len(upperstage_data), 5):  # Plus de points pour voir la descente
+        row = upperstage_data[i]
+        upperstage_trajectory.append({
+            "time": row.get('UpperStage.UTCGregorian', ''),
+            "altitude": float(row.get('UpperStage.Earth.Altitude', 0))
+        })
+
+    # Construire la réponse complète
+    response = {
+        "success": True,
+        "mission_id": mission_id,
+        "mission_name": params['mission_name'],
+        "timestamp": datetime.now().isoformat(),
+        "metrics": metrics,
+        "costs": costs,
+        "satellite_trajectory": satellite_trajectory,
+        "upperstage_trajectory": upperstage_trajectory,
+        "simulation": simulation,
+        "files": {
+            "satellite_report": f"/api/download/{mission_id}/satellite_report",
+            "upperstage_report": f"/api/download/{mission_id}/upperstage_report",
+            "script": f"/api/download/{mission_id}/script",
+            "ephemeris_oem": f"/api/missions/{mission_id}/export?format=oem"
+        }
+    }
+    
+    if owns_mission and not owns_mission():
+        return lease_lost_error(mission_id)
+
+    # Sauvegarder la réponse complète (écriture atomique : l'API peut la lire à tout moment)
+    write_json_atomic(mission_dir / 'results.json', response)
+    
+    return response, 200
+
+
+class MissionSpool:
+    """
+    File d'attente de missions partagée entre l'API et les workers GMAT.
+
+    Le spool est un simple répertoire (local ou monté en réseau) :
+      pending/  missions en attente d'un worker
+      claimed/  missions réclamées, avec le bail (lease) du worker
+      failed/   missions abandonnées après max_attempts tentatives
+      workers/  fichiers heartbeat des workers (capacité, missions actives)
+    Les transitions utilisent os.rename, atomique sur un même système de fichiers :
+    un seul worker peut réclamer une mission donnée.
+    """
+
+    def __init__(self, spool_dir, lease_seconds=60, max_attempts=3):
+        self.spool_dir = Path(spool_dir)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.pending_dir = self.spool_dir / 'pending'
+        self.claimed_dir = self.spool_dir / 'claimed'
+        self.failed_dir = self.spool_dir / 'failed'
+        self.workers_dir = self.spool_dir / 'workers'
+        for directory in (self.pending_dir, self.claimed_dir, self.failed_dir, self.workers_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _read_json(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def submit(self, mission_id, params):
+        """Ajoute une mission dans la file d'attente"""
+        job = {
             "mission_id": mission_id,
-            "mission_name": params['mission_name'],
-            "timestamp": datetime.now().isoformat(),
-            "metrics": metrics,
-            "costs": costs,
-            "satellite_trajectory": satellite_trajectory,
-            "upperstage_trajectory": upperstage_trajectory,
-            "files": {
-                "satellite_report": f"/api/download/{mission_id}/satellite_report",
-                "upperstage_report": f"/api/download/{mission_id}/upperstage_report",
-                "script": f"/api/download/{mission_id}/script"
+            "params": params,
+            "submitted_at": time.time(),
+            "attempts": 0
+        }
+        write_json_atomic(self.pending_dir / f'{mission_id}.json', job)
+        return job
+
+    @staticmethod
+    def _mtime(path):
+        """Date de modification, ou 0 si un autre worker vient de déplacer le fichier"""
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return 0
+
+    def claim(self, worker_id):
+        """Réclame la plus ancienne mission en attente, ou None si la file est vide"""
+        pending = sorted(self.pending_dir.glob('*.json'), key=self._mtime)
+        for path in pending:
+            claimed_path = self.claimed_dir / path.name
+            try:
+                os.rename(path, claimed_path)
+            except FileNotFoundError:
+                # Un autre worker a réclamé cette mission avant nous
+                continue
+
+            try:
+                job = self._read_json(claimed_path)
+            except json.JSONDecodeError:
+                print(f"[ERROR] Unreadable spool job {path.name}, moved to failed/")
+                os.replace(claimed_path, self.failed_dir / path.name)
+                continue
+            job['attempts'] = job.get('attempts', 0) + 1
+            job['worker_id'] = worker_id
+            job['claimed_at'] = time.time()
+            job['lease_expires'] = time.time() + self.lease_seconds
+            write_json_atomic(claimed_path, job)
+            return job
+        return None
+
+    def _read_claim(self, mission_id):
+        """
+        Bail d'une mission réclamée, ou None. Pendant que requeue_expired l'examine
+        sous son nom privé (.reaping), on attend qu'elle soit restituée ou déplacée.
+        """
+        claimed_path = self.claimed_dir / f'{mission_id}.json'
+        for _ in range(100):
+            try:
+                return self._read_json(claimed_path)
+            except FileNotFoundError:
+                pass
+            if not any(self.claimed_dir.glob(f'.{mission_id}.*.reaping')):
+                try:
+                    return self._read_json(claimed_path)
+                except FileNotFoundError:
+                    return None
+            time.sleep(0.01)
+        return None
+
+    def renew(self, mission_id, worker_id):
+        """Prolonge le bail d'une mission; False si le worker l'a perdue"""
+        claimed_path = self.claimed_dir / f'{mission_id}.json'
+        job = self._read_claim(mission_id)
+        if job is None or job.get('worker_id') != worker_id:
+            return False
+        job['lease_expires'] = time.time() + self.lease_seconds
+        write_json_atomic(claimed_path, job)
+        return True
+
+    def complete(self, mission_id, worker_id):
+        """
+        Retire une mission terminée (succès ou échec GMAT) du spool, seulement si
+        worker_id détient encore le bail; False sinon (mission réclamée par un autre)
+        """
+        job = self._read_claim(mission_id)
+        if job is None or job.get('worker_id') != worker_id:
+            return False
+        (self.claimed_dir / f'{mission_id}.json').unlink(missing_ok=True)
+        return True
+
+    def requeue_expired(self):
+        """
+        Remet en file les missions dont le bail a expiré (worker mort ou bloqué).
+        Au-delà de max_attempts, la mission est déplacée dans failed/.
+
+        Chaque mission expirée est d'abord renommée sous un nom privé (.reaping),
+        puis relue : si entre-temps un autre processus l'a remise en file et qu'un
+        worker l'a réclamée (ou si son bail a été renouvelé), elle est restituée
+        au lieu de déplacer une réclamation vivante.
+        """
+        now = time.time()
+        self._restore_stale_reaping(now)
+        requeued = []
+        for path in self.claimed_dir.glob('*.json'):
+            try:
+                job = self._read_json(path)
+                # Bail pas encore écrit juste après le rename : on se base sur ctime
+                lease_expires = job.get('lease_expires', path.stat().st_ctime + self.lease_seconds)
+            except FileNotFoundError:
+                continue
+            if lease_expires > now:
+                continue
+
+            reaping_path = self.claimed_dir / f'.{path.stem}.{uuid.uuid4().hex[:8]}.reaping'
+            try:
+                os.rename(path, reaping_path)
+            except FileNotFoundError:
+                continue
+            current = self._read_json(reaping_path)
+            still_expired = current.get('lease_expires', lease_expires) <= time.time()
+            same_claim = (current.get('worker_id'), current.get('claimed_at')) == \
+                (job.get('worker_id'), job.get('claimed_at'))
+            if path.exists():
+                # Bail renouvelé pendant le renommage : la version réécrite fait foi
+                reaping_path.unlink()
+                continue
+            if not (same_claim and still_expired):
+                os.rename(reaping_path, path)
+                continue
+
+            mission_id = current['mission_id']
+            if current.get('attempts', 0) >= self.max_attempts:
+                os.rename(reaping_path, self.failed_dir / path.name)
+                print(f"[ERROR] Mission {mission_id} failed after {current['attempts']} attempts")
+                write_mission_error(mission_id, {
+                    "error": "GMAT worker lost",
+                    "details": f"Mission abandoned after {current['attempts']} attempts"
+                }, 500)
+            else:
+                # Sans l'ancien bail : une fois réclamée, la mission n'est pas vue expirée
+                # avant que son nouveau worker n'écrive le sien
+                write_json_atomic(reaping_path, {key: value for key, value in current.items()
+                                                 if key not in ('worker_id', 'claimed_at', 'lease_expires')})
+                os.rename(reaping_path, self.pending_dir / path.name)
+                print(f"[WARNING] Lease expired for mission {mission_id} "
+                      f"(worker {current.get('worker_id')}), re-queued")
+                requeued.append(mission_id)
+        return requeued
+
+    def _restore_stale_reaping(self, now):
+        """Restitue les missions d'un requeue_expired interrompu (processus tué pendant le déplacement)"""
+        for reaping_path in self.claimed_dir.glob('.*.reaping'):
+            mission_id = reaping_path.name[1:].rsplit('.', 2)[0]
+            try:
+                if reaping_path.stat().st_ctime + self.lease_seconds > now:
+                    continue
+                if (self.claimed_dir / f'{mission_id}.json').exists():
+                    reaping_path.unlink()
+                else:
+                    os.rename(reaping_path, self.claimed_dir / f'{mission_id}.json')
+            except FileNotFoundError:
+                continue
+
+    def heartbeat(self, worker_id, capacity, active_jobs, started_at):
+        """Publie l'état d'un worker dans workers/"""
+        write_json_atomic(self.workers_dir / f'{worker_id}.json', {
+            "worker_id": worker_id,
+            "hostname": socket.gethostname(),
+            "pid": os.getpid(),
+            "capacity": capacity,
+            "active_jobs": active_jobs,
+            "started_at": started_at,
+            "last_heartbeat": time.time()
+        })
+
+    def deregister(self, worker_id):
+        (self.workers_dir / f'{worker_id}.json').unlink(missing_ok=True)
+
+    def job_status(self, mission_id):
+        """Statut d'une mission dans le spool (queued, running, failed) ou None"""
+        if (self.pending_dir / f'{mission_id}.json').exists():
+            return {"status": "queued"}
+        job = self._read_claim(mission_id)
+        if job is not None:
+            return {"status": "running", "worker_id": job.get('worker_id'), "attempts": job.get('attempts')}
+        if (self.failed_dir / f'{mission_id}.json').exists():
+            return {"status": "failed"}
+        return None
+
+    def status(self):
+        """État de la flotte : workers vivants, capacité et tailles des files"""
+        now = time.time()
+        workers = []
+        for path in self.workers_dir.glob('*.json'):
+            try:
+                worker = self._read_json(path)
+            except FileNotFoundError:
+                continue
+            worker['alive'] = now - worker['last_heartbeat'] < self.lease_seconds
+            workers.append(worker)
+        workers.sort(key=lambda w: w['worker_id'])
+
+        alive_workers = [w for w in workers if w['alive']]
+        return {
+            "workers": workers,
+            "alive_workers": len(alive_workers),
+            "total_capacity": sum(w['capacity'] for w in alive_workers),
+            "busy_slots": sum(len(w['active_jobs']) for w in alive_workers),
+            "queue": {
+                "pending": len(list(self.pending_dir.glob('*.json'))),
+                "claimed": len(list(self.claimed_dir.glob('*.json'))),
+                "failed": len(list(self.failed_dir.glob('*.json')))
             }
         }
+
+
+def write_mission_error(mission_id, payload, status):
+    """Enregistre l'échec d'une mission dans error.json (lu par l'API en attente)"""
+    mission_dir = get_config().missions_dir / mission_id
+    mission_dir.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(mission_dir / 'error.json', {"status": status, "response": payload})
+
+
+def wait_for_mission(mission_id, timeout=None, poll_interval=0.5):
+    """
+    Attend qu'un worker écrive results.json ou error.json pour une mission.
+    Retourne un tuple (payload, status_code) comme execute_mission.
+    """
+    config = get_config()
+    timeout = timeout or config.wait_timeout_seconds
+    mission_dir = config.missions_dir / mission_id
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if (mission_dir / 'results.json').exists():
+            with open(mission_dir / 'results.json', 'r') as f:
+                return json.load(f), 200
+        if (mission_dir / 'error.json').exists():
+            with open(mission_dir / 'error.json', 'r') as f:
+                error = json.load(f)
+            return error['response'], error['status']
+        time.sleep(poll_interval)
+
+    return {
+        "error": f"Mission not completed after {timeout} seconds",
+        "mission_id": mission_id,
+        "status_url": f"/api/missions/{mission_id}/status"
+    }, 504
+
+
+class GMATWorker:
+    """
+    Worker GMAT : réclame des missions dans le spool et les exécute.
+    Plusieurs workers (sur une ou plusieurs machines) peuvent partager le même spool
+    et le même missions_dir.
+    """
+
+    def __init__(self, spool, worker_id=None, capacity=1):
+        self.spool = spool
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.capacity = capacity
+        self.started_at = time.time()
+        self.active = {}  # mission_id -> thread
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def _run_job(self, job):
+        mission_id = job['mission_id']
+
+        def owns_mission():
+            # Renouvelle le bail : False si la mission a été remise en file et réclamée ailleurs
+            if self.spool.renew(mission_id, self.worker_id):
+                return True
+            print(f"[WARNING] Worker {self.worker_id} lost lease on mission {mission_id}, results discarded")
+            return False
+
+        try:
+            print(f"[INFO] Worker {self.worker_id} running mission {mission_id} (attempt {job['attempts']})")
+            payload, status = execute_mission(job['params'], mission_id, owns_mission)
+            if status not in (200, 409) and owns_mission():
+                write_mission_error(mission_id, payload, status)
+        except Exception as e:
+            if owns_mission():
+                write_mission_error(mission_id, {"error": f"Internal server error: {str(e)}"}, 500)
+        finally:
+            self.spool.complete(mission_id, self.worker_id)
+            with self.lock:
+                self.active.pop(mission_id, None)
+
+    def heartbeat(self):
+        with self.lock:
+            active_jobs = list(self.active)
+        for mission_id in active_jobs:
+            if not self.spool.renew(mission_id, self.worker_id):
+                print(f"[WARNING] Worker {self.worker_id} lost lease on mission {mission_id}")
+        self.spool.heartbeat(self.worker_id, self.capacity, active_jobs, self.started_at)
+        self.spool.requeue_expired()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self, poll_interval=1.0):
+        """Boucle principale : heartbeat, réclamation de missions jusqu'à la capacité"""
+        print(f"[INFO] Worker {self.worker_id} started (capacity {self.capacity}, spool {self.spool.spool_dir})")
+        config = get_config()
+        if config.sandbox_enabled:
+            # Bac à sable prêt avant la première mission
+            get_gmat_sandbox(self.worker_id)
+        last_heartbeat = 0
+        try:
+            # Après stop(), on ne réclame plus rien mais on garde les baux jusqu'à la fin des missions
+            while not self.stop_event.is_set() or self.active:
+                try:
+                    if time.time() - last_heartbeat >= config.heartbeat_seconds:
+                        self.heartbeat()
+                        last_heartbeat = time.time()
+
+                    while not self.stop_event.is_set() and len(self.active) < self.capacity:
+                        job = self.spool.claim(self.worker_id)
+                        if job is None:
+                            break
+                        thread = threading.Thread(target=self._run_job, args=(job,), daemon=True)
+                        with self.lock:
+                            self.active[job['mission_id']] = thread
+                        thread.start()
+                except Exception as e:
+                    # Une erreur du spool (ex. partage réseau indisponible) ne doit pas arrêter le worker
+                    print(f"[ERROR] Worker {self.worker_id} spool error: {str(e)}")
+
+                time.sleep(poll_interval)
+        finally:
+            self.spool.deregister(self.worker_id)
+            print(f"[INFO] Worker {self.worker_id} stopped")
+
+
+_mission_spool = None
+
+
+def get_mission_spool():
+    """Spool partagé avec les workers, créé au premier usage"""
+    global _mission_spool
+    if _mission_spool is None:
+        config = get_config()
+        _mission_spool = MissionSpool(config.spool_dir, config.lease_seconds, config.max_attempts)
+    return _mission_spool
+
+
+# Modes de désorbitation proposés par défaut à la comparaison
+DEORBIT_MODES = ['rapid', 'standard', 'gentle']
+
+
+def validate_mission_params(params, required_fields):
+    """Validation basique des paramètres de mission, retourne un message d'erreur ou None"""
+    for field in required_fields:
+        if field not in params:
+            return f"Missing required field: {field}"
+
+    # Validation des ranges
+    if not (1 <= params['satellite_mass'] <= 50):
+        return "Satellite mass must be between 1 and 50 kg"
+
+    if not (300 <= params['target_altitude'] <= 800):
+        return "Target altitude must be between 300 and 800 km"
+
+    return None
+
+
+def submit_mission(params):
+    """
+    Crée le dossier d'une nouvelle mission avec ses paramètres d'entrée et, si le
+    spool est activé, la confie aux workers. Retourne l'identifiant de mission.
+    """
+    # Générer un ID unique pour cette mission
+    config = get_config()
+    mission_id = str(uuid.uuid4())[:8]
+    mission_dir = config.missions_dir / mission_id
+    mission_dir.mkdir(parents=True, exist_ok=True)
+
+    # Sauvegarder les paramètres d'entrée
+    with open(mission_dir / 'input.json', 'w') as f:
+        json.dump(params, f, indent=2)
+
+    if config.spool_enabled:
+        get_mission_spool().submit(mission_id, params)
+        print(f"[INFO] Mission {mission_id} submitted to spool {config.spool_dir}")
+    return mission_id
+
+
+def collect_mission(mission_id, params):
+    """Résultat d'une mission soumise : attendu des workers, ou exécuté localement"""
+    if get_config().spool_enabled:
+        return wait_for_mission(mission_id)
+    return execute_mission(params, mission_id)
+
+
+@api.route('/api/calculate-mission', methods=['POST'])
+def calculate_mission():
+    """
+    Endpoint principal pour calculer une mission
+    """
+    try:
+        # Récupérer les données du formulaire
+        params = request.json
         
-        # Sauvegarder la réponse complète
-        with open(mission_dir / 'results.json', 'w') as f:
-            json.dump(response, f, indent=2)
+        # Validation basique
+        required_fields = ['mission_name', 'satellite_name', 'satellite_mass', 
+                          'target_altitude', 'orbit_type', 'launch_date', 'deorbit_mode']
+        error = validate_mission_params(params, required_fields)
+        if error:
+            return jsonify({"error": error}), 400
         
-        return jsonify(response)
+        # Exécuter la mission (localement ou via le spool des workers)
+        mission_id = submit_mission(params)
+        payload, status = collect_mission(mission_id, params)
+
+        return jsonify(payload), status
     
     except Exception as e:
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 
-@app.route('/api/download/<mission_id>/<file_type>', methods=['GET'])
+@api.route('/api/compare-deorbit-modes', methods=['POST'])
+def compare_deorbit_modes():
+    """
+    Calcule la même mission pour plusieurs modes de désorbitation.
+    Le premier mode est simulé seul : il remplit le cache des phases communes
+    (mise en orbite), que les modes suivants reprennent sans les re-simuler.
+    """
+    try:
+        params = request.json
+
+        required_fields = ['mission_name', 'satellite_name', 'satellite_mass',
+                           'target_altitude', 'orbit_type', 'launch_date']
+        error = validate_mission_params(params, required_fields)
+        if error:
+            return jsonify({"error": error}), 400
+
+        modes = params.get('modes', DEORBIT_MODES)
+        if not isinstance(modes, list) or not modes or any(mode not in DEORBIT_MODES for mode in modes):
+            return jsonify({"error": f"modes must be a non-empty list of: {', '.join(DEORBIT_MODES)}"}), 400
+        modes = list(dict.fromkeys(modes))
+
+        base_params = {k: v for k, v in params.items() if k != 'modes'}
+        variants = {mode: dict(base_params, deorbit_mode=mode) for mode in modes}
+
+        # Premier mode, puis les autres (en parallèle sur les workers si le spool est activé)
+        results = {}
+        first_id = submit_mission(variants[modes[0]])
+        results[modes[0]] = (first_id, collect_mission(first_id, variants[modes[0]]))
+        submitted = [(mode, submit_mission(variants[mode])) for mode in modes[1:]]
+        for mode, mission_id in submitted:
+            results[mode] = (mission_id, collect_mission(mission_id, variants[mode]))
+
+        comparison = []
+        for mode in modes:
+            mission_id, (payload, status) = results[mode]
+            entry = {"deorbit_mode": mode, "mission_id": mission_id, "status": status}
+            if status == 200:
+                entry.update({
+                    "metrics": payload['metrics'],
+                    "costs": payload['costs'],
+                    "simulation": payload.get('simulation'),
+                    "files": payload['files']
+                })
+            else:
+                entry["error"] = payload
+            comparison.append(entry)
+
+        return jsonify({
+            "success": all(entry['status'] == 200 for entry in comparison),
+            "mission_name": params['mission_name'],
+            "comparison": comparison
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+
+def get_report_path(mission_id, report_name):
+    """
+    Chemin d'un rapport GMAT ('satellite' ou 'upperstage') : d'abord dans le dossier
+    de mission, puis dans le dossier output de GMAT (pour anciennes missions)
+    """
+    config = get_config()
+    file_path = config.missions_dir / mission_id / f'mission_{mission_id}_{report_name}.txt'
+    if not file_path.exists():
+        file_path = config.gmat_output_dir / f'mission_{mission_id}_{report_name}.txt'
+    return file_path
+
+
+@api.route('/api/download/<mission_id>/<file_type>', methods=['GET'])
 def download_file(mission_id, file_type):
     """
     Endpoint pour télécharger les fichiers de mission
     """
-    mission_dir = MISSIONS_DIR / mission_id
+    mission_dir = get_config().missions_dir / mission_id
 
     if not mission_dir.exists():
         return jsonify({"error": "Mission not found"}), 404
 
-    # Chercher d'abord dans le dossier de mission, puis dans le dossier output de GMAT (pour anciennes missions)
     if file_type == "satellite_report" or file_type == "mission_report":  # Legacy support
-        # Chercher d'abord dans le dossier de mission
-        file_path = mission_dir / f'mission_{mission_id}_satellite.txt'
-        if not file_path.exists():
-            # Fallback vers le dossier output de GMAT
-            file_path = GMAT_OUTPUT_DIR / f'mission_{mission_id}_satellite.txt'
+        file_path = get_report_path(mission_id, 'satellite')
     elif file_type == "upperstage_report" or file_type == "deorbit_report":  # Legacy support
-        # Chercher d'abord dans le dossier de mission
-        file_path = mission_dir / f'mission_{mission_id}_upperstage.txt'
-        if not file_path.exists():
-            # Fallback vers le dossier output de GMAT
-            file_path = GMAT_OUTPUT_DIR / f'mission_{mission_id}_upperstage.txt'
+        file_path = get_report_path(mission_id, 'upperstage')
     elif file_type == "script":
         file_path = mission_dir / f'mission_{mission_id}.script'
     elif file_type == "results":
@@ -701,12 +2196,12 @@ def download_file(mission_id, file_type):
     return send_file(file_path, as_attachment=True)
 
 
-@app.route('/api/missions/<mission_id>', methods=['GET'])
+@api.route('/api/missions/<mission_id>', methods=['GET'])
 def get_mission(mission_id):
     """
     Récupérer les résultats d'une mission existante
     """
-    mission_dir = MISSIONS_DIR / mission_id
+    mission_dir = get_config().missions_dir / mission_id
     results_file = mission_dir / 'results.json'
     
     if not results_file.exists():
@@ -718,20 +2213,112 @@ def get_mission(mission_id):
     return jsonify(results)
 
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/missions/<mission_id>/export', methods=['GET'])
+def export_ephemeris(mission_id):
+    """
+    Export en flux de l'éphéméride du satellite (CCSDS OEM, CSV ou JSONL)
+    Paramètres : format=oem|csv|jsonl, step=<secondes> (optionnel), gzip=1 (optionnel)
+    """
+    if not (get_config().missions_dir / mission_id).exists():
+        return jsonify({"error": "Mission not found"}), 404
+
+    export_format = request.args.get('format', 'oem').lower()
+    if export_format not in EphemerisExporter.FORMATS:
+        return jsonify({"error": "Invalid export format (use oem, csv or jsonl)"}), 400
+
+    try:
+        step = float(request.args['step']) if 'step' in request.args else None
+    except ValueError:
+        step = math.nan
+    if step is not None and not (math.isfinite(step) and step >= EphemerisExporter.MIN_STEP):
+        return jsonify({
+            "error": f"Resampling step must be a number of seconds >= {EphemerisExporter.MIN_STEP}"
+        }), 400
+    compress = request.args.get('gzip', '0').lower() in ('1', 'true', 'yes')
+
+    report_path = get_report_path(mission_id, 'satellite')
+    if not report_path.exists():
+        return jsonify({"error": "File not found"}), 404
+
+    try:
+        chunks = EphemerisExporter.export(report_path, export_format, mission_id, step=step, compress=compress)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 422
+
+    mimetype, extension = EphemerisExporter.FORMATS[export_format]
+    filename = f'mission_{mission_id}_satellite.{extension}'
+    if compress:
+        mimetype = 'application/gzip'
+        filename += '.gz'
+
+    # Pas de Content-Length : la réponse est envoyée en chunked transfer encoding
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@api.route('/api/missions/<mission_id>/status', methods=['GET'])
+def get_mission_status(mission_id):
+    """
+    Statut d'une mission : completed, failed, queued ou running (mode spool)
+    """
+    mission_dir = get_config().missions_dir / mission_id
+
+    if (mission_dir / 'results.json').exists():
+        return jsonify({"mission_id": mission_id, "status": "completed"})
+
+    if (mission_dir / 'error.json').exists():
+        with open(mission_dir / 'error.json', 'r') as f:
+            error = json.load(f)
+        return jsonify({"mission_id": mission_id, "status": "failed", **error['response']})
+
+    # Sans spool, une mission sans résultat est inconnue (ou n'a pas abouti)
+    spool_status = get_mission_spool().job_status(mission_id) if get_config().spool_enabled else None
+    if spool_status is None:
+        return jsonify({"error": "Mission not found"}), 404
+
+    return jsonify({"mission_id": mission_id, **spool_status})
+
+
+@api.route('/api/fleet', methods=['GET'])
+def fleet_status():
+    """
+    État de la flotte de workers GMAT (heartbeats, capacité, files du spool)
+    """
+    config = get_config()
+    if not config.spool_enabled:
+        # Mode local : pas de flotte, et pas de spool créé sur disque
+        return jsonify({"spool_enabled": False})
+
+    mission_spool = get_mission_spool()
+    mission_spool.requeue_expired()
+    return jsonify({
+        "spool_enabled": config.spool_enabled,
+        "spool_dir": str(config.spool_dir),
+        **mission_spool.status()
+    })
+
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """
-    Health check endpoint
+    Health check endpoint (recherche de GMAT faite une fois par processus)
     """
+    try:
+        config = get_config()
+    except (FileNotFoundError, ValueError) as e:
+        return jsonify({"status": "unhealthy", "error": str(e)}), 503
+
     return jsonify({
         "status": "healthy",
-        "gmat_available": os.path.exists(GMAT_PATH),
-        "gmat_path": GMAT_PATH,
-        "missions_dir": str(MISSIONS_DIR)
+        **config.probe_gmat(),
+        "missions_dir": str(config.missions_dir)
     })
 
 
-@app.route('/api/validate-params', methods=['POST'])
+@api.route('/api/validate-params', methods=['POST'])
 def validate_params():
     """
     Valide les paramètres avant exécution complète
@@ -762,9 +2349,28 @@ def validate_params():
 
 
 if __name__ == '__main__':
-    print("AFREELEO Backend Server Starting...")
-    print(f"GMAT Path: {GMAT_PATH}")
-    print(f"Missions Directory: {MISSIONS_DIR}")
-    print(f"GMAT Available: {os.path.exists(GMAT_PATH)}")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AFREELEO Backend")
+    parser.add_argument('role', nargs='?', default='api', choices=['api', 'worker'],
+                        help="api: Flask server, worker: GMAT worker reading the spool")
+    parser.add_argument('--worker-id', help="Worker identifier (default: hostname-pid)")
+    parser.add_argument('--capacity', type=int,
+                        help="Number of concurrent GMAT runs for this worker (default: spool.capacity)")
+    args = parser.parse_args()
+    config = get_config()
+
+    if args.role == 'worker':
+        worker = GMATWorker(get_mission_spool(), worker_id=args.worker_id,
+                            capacity=args.capacity or config.spool_capacity)
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            pass
+    else:
+        print("AFREELEO Backend Server Starting...")
+        print(f"GMAT Path: {config.gmat_path}")
+        print(f"Missions Directory: {config.missions_dir}")
+        print(f"GMAT Available: {config.probe_gmat()['gmat_available']}")
+        print(f"Execution Mode: {'spool (' + str(config.spool_dir) + ')' if config.spool_enabled else 'local'}")
+
+        create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,85 @@
+"""
+Fixtures communes : installation GMAT factice (tests/fake_gmat/GmatConsole) et
+configuration du backend dans un dossier temporaire
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import script  # noqa: E402
+
+FAKE_GMAT_CONSOLE = Path(__file__).resolve().parent / 'fake_gmat' / 'GmatConsole'
+
+MISSION_PARAMS = {
+    "mission_name": "Test Mission",
+    "satellite_name": "Test Sat",
+    "satellite_mass": 10,
+    "target_altitude": 680,
+    "orbit_type": "polar",
+    "launch_date": "2026-10-10",
+    "deorbit_mode": "standard"
+}
+
+
+@pytest.fixture
+def gmat_install(tmp_path):
+    """Arborescence GMAT (bin/, output/) avec le faux GmatConsole"""
+    bin_dir = tmp_path / 'gmat' / 'bin'
+    bin_dir.mkdir(parents=True)
+    shutil.copy2(FAKE_GMAT_CONSOLE, bin_dir / 'GmatConsole')
+    (bin_dir / 'gmat_startup_file.txt').write_text('OUTPUT_PATH = ../output/\n')
+    return tmp_path / 'gmat'
+
+
+@pytest.fixture
+def backend_config(tmp_path, gmat_install):
+    return {
+        "gmat": {"bin_dir": str(gmat_install / 'bin'), "output_dir": str(gmat_install / 'output')},
+        "missions_dir": str(tmp_path / 'missions_data'),
+        "checkpoints_dir": str(tmp_path / 'checkpoints_data'),
+        "spool": {
+            "enabled": False,
+            "dir": str(tmp_path / 'spool_data'),
+            "lease_seconds": 1,
+            "heartbeat_seconds": 0.2,
+            "max_attempts": 3,
+            "wait_timeout_seconds": 60
+        }
+    }
+
+
+@pytest.fixture
+def configure_backend(monkeypatch):
+    """Applique une configuration (sans variables AFREELEO_* de l'environnement)"""
+    for variable in script.ENV_OVERRIDES:
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.delenv('AFREELEO_CONFIG', raising=False)
+
+    def apply(config):
+        script.configure(config)
+        return script.create_app().test_client()
+
+    yield apply
+    script.configure(None)
+
+
+@pytest.fixture
+def client(configure_backend, backend_config):
+    return configure_backend(backend_config)
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """Écrit la configuration dans un fichier (pour les workers lancés en sous-processus)"""
+    def write(config):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps(config))
+        return path
+    return write
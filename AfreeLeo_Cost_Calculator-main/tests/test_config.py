@@ -0,0 +1,149 @@
+"""
+Configuration du backend : fabrique d'application, import sans effet de bord,
+variables AFREELEO_*, validation et health check
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import script
+from conftest import BACKEND_DIR
+
+
+def test_create_app_configures_the_whole_process(configure_backend, backend_config, tmp_path):
+    backend_config['sandbox'] = {"enabled": True, "dir": str(tmp_path / 'sandboxes')}
+    first = configure_backend(backend_config)
+    sandbox = script.get_gmat_sandbox()
+    assert sandbox.path.exists()
+
+    other = dict(backend_config, missions_dir=str(tmp_path / 'other_missions'))
+    second = script.create_app(other).test_client()
+
+    # La configuration est celle du processus : la première application la voit aussi
+    assert first.get('/api/health').json['missions_dir'] == str(tmp_path / 'other_missions')
+    assert second.get('/api/health').json['missions_dir'] == str(tmp_path / 'other_missions')
+    # L'ancien bac à sable est supprimé, pas abandonné
+    assert not sandbox.path.exists()
+    assert script.gmat_sandbox is None
+
+
+def test_import_has_no_side_effects(tmp_path):
+    env = {k: v for k, v in os.environ.items() if not k.startswith('AFREELEO_')}
+    env['AFREELEO_CONFIG'] = str(tmp_path / 'missing.json')
+    code = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {str(BACKEND_DIR)!r})\n"
+        "import script\n"
+        "assert script._config is None and script._mission_spool is None and script.gmat_sandbox is None\n"
+        "try:\n"
+        "    script.get_config()\n"
+        "except FileNotFoundError:\n"
+        "    print('config not found')\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == 'config not found\n'
+    # Ni missions_data, ni spool, ni checkpoints créés à l'import
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize('value, enabled', [
+    ('1', True), ('true', True), (' Yes ', True), ('ON', True),
+    ('0', False), ('false', False), ('no', False), ('', False)
+])
+def test_enabled_env_overrides(configure_backend, backend_config, monkeypatch, value, enabled):
+    backend_config['sandbox'] = {"enabled": not enabled}
+    backend_config['spool']['enabled'] = not enabled
+    monkeypatch.setenv('AFREELEO_SPOOL_ENABLED', value)
+    monkeypatch.setenv('AFREELEO_SANDBOX_ENABLED', value)
+
+    config = script.BackendConfig(backend_config)
+
+    assert config.spool_enabled is enabled
+    assert config.sandbox_enabled is enabled
+
+
+def test_path_env_overrides(configure_backend, backend_config, monkeypatch, tmp_path):
+    original = json.loads(json.dumps(backend_config))
+    for variable in ('AFREELEO_MISSIONS_DIR', 'AFREELEO_CHECKPOINTS_DIR', 'AFREELEO_SPOOL_DIR',
+                     'AFREELEO_GMAT_DATA_DIR', 'AFREELEO_SANDBOX_DIR'):
+        monkeypatch.setenv(variable, str(tmp_path / variable.lower()))
+
+    config = script.BackendConfig(backend_config)
+
+    assert config.missions_dir == tmp_path / 'afreeleo_missions_dir'
+    assert config.checkpoints_dir == tmp_path / 'afreeleo_checkpoints_dir'
+    assert config.spool_dir == tmp_path / 'afreeleo_spool_dir'
+    assert config.gmat_data_dir == tmp_path / 'afreeleo_gmat_data_dir'
+    assert config.sandbox_root == tmp_path / 'afreeleo_sandbox_dir'
+    # Le dictionnaire de configuration n'est pas modifié
+    assert backend_config == original
+
+
+def test_config_file_is_optional_with_gmat_paths_in_env(configure_backend, gmat_install, monkeypatch, tmp_path):
+    monkeypatch.setenv('AFREELEO_CONFIG', str(tmp_path / 'missing.json'))
+    monkeypatch.setenv('AFREELEO_GMAT_BIN_DIR', str(gmat_install / 'bin'))
+    with pytest.raises(FileNotFoundError, match='Configuration file not found'):
+        script.load_config()
+
+    monkeypatch.setenv('AFREELEO_GMAT_OUTPUT_DIR', str(gmat_install / 'output'))
+    monkeypatch.setenv('AFREELEO_MISSIONS_DIR', str(tmp_path / 'missions_data'))
+    assert script.load_config() == {}
+
+    configure_backend(None)
+    config = script.get_config()
+    assert config.gmat_bin_dir == str(gmat_install / 'bin')
+    assert config.probe_gmat()['gmat_available'] is True
+
+
+@pytest.mark.parametrize('section, key, value', [
+    ('gmat', 'output_dir', None),
+    ('spool', 'lease_seconds', 0),
+    ('spool', 'heartbeat_seconds', -1),
+    ('spool', 'max_attempts', 'three'),
+    ('spool', 'capacity', True),
+    ('spool', 'wait_timeout_seconds', -5)
+])
+def test_invalid_settings_raise_value_error(configure_backend, backend_config, section, key, value):
+    if value is None:
+        del backend_config[section][key]
+    else:
+        backend_config[section][key] = value
+
+    with pytest.raises(ValueError, match=rf'Invalid configuration: .*{section}\.{key}'):
+        script.BackendConfig(backend_config)
+
+
+def test_health_check(client):
+    response = client.get('/api/health')
+
+    assert response.status_code == 200
+    assert response.json['status'] == 'healthy'
+    assert response.json['gmat_available'] is True
+
+
+def test_health_check_reports_missing_config(configure_backend, monkeypatch, tmp_path):
+    monkeypatch.setenv('AFREELEO_CONFIG', str(tmp_path / 'missing.json'))
+    client = configure_backend(None)
+
+    response = client.get('/api/health')
+
+    assert response.status_code == 503
+    assert response.json['status'] == 'unhealthy'
+    assert 'Configuration file not found' in response.json['error']
+
+
+def test_health_check_reports_invalid_config(configure_backend, backend_config, write_config, monkeypatch):
+    backend_config['spool']['lease_seconds'] = -1
+    monkeypatch.setenv('AFREELEO_CONFIG', str(write_config(backend_config)))
+    client = configure_backend(None)
+
+    response = client.get('/api/health')
+
+    assert response.status_code == 503
+    assert 'spool.lease_seconds' in response.json['error']
@@ -0,0 +1,58 @@
+"""
+Export d'éphéméride (GET /api/missions/<id>/export) sur une mission simulée
+par le faux GmatConsole
+"""
+
+import json
+
+import pytest
+
+from conftest import MISSION_PARAMS
+
+
+@pytest.fixture
+def mission_id(client):
+    response = client.post('/api/calculate-mission', json=MISSION_PARAMS)
+    assert response.status_code == 200
+    return response.json['mission_id']
+
+
+def oem_epochs(text):
+    return [line.split()[0] for line in text.splitlines() if line[:4].isdigit()]
+
+
+def test_oem_epochs_are_strictly_increasing(client, mission_id):
+    # Le rapport répète l'état de frontière au début de chaque Propagate
+    report = client.get(f'/api/download/{mission_id}/satellite_report').data.decode()
+    elapsed = [float(line.split()[4]) for line in report.splitlines()[1:]]
+    assert len(set(elapsed)) < len(elapsed)
+
+    response = client.get(f'/api/missions/{mission_id}/export?format=oem')
+    assert response.status_code == 200
+    epochs = oem_epochs(response.data.decode())
+    assert len(epochs) == len(set(elapsed))
+    assert epochs == sorted(set(epochs))
+
+
+def test_csv_and_jsonl_drop_repeated_states(client, mission_id):
+    rows = client.get(f'/api/missions/{mission_id}/export?format=csv').data.decode().splitlines()[1:]
+    elapsed = [float(row.split(',')[1]) for row in rows]
+    assert elapsed == sorted(set(elapsed))
+
+    lines = client.get(f'/api/missions/{mission_id}/export?format=jsonl').data.decode().splitlines()
+    assert len(lines) == len(rows)
+    assert json.loads(lines[0])['elapsed_s'] == 0.0
+
+
+def test_resampled_oem(client, mission_id):
+    epochs = oem_epochs(client.get(f'/api/missions/{mission_id}/export?format=oem&step=10').data.decode())
+    assert epochs == sorted(set(epochs))
+    assert epochs[1].endswith(':10.000')
+
+
+@pytest.mark.parametrize('step', ['0', '-5', 'nan', 'inf', '-inf', '1e-9', 'abc'])
+def test_invalid_steps_are_rejected(client, mission_id, step):
+    for export_format in ('oem', 'csv'):
+        response = client.get(f'/api/missions/{mission_id}/export?format={export_format}&step={step}')
+        assert response.status_code == 400
+        assert 'step' in response.json['error']
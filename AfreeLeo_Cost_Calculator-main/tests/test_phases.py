@@ -0,0 +1,134 @@
+"""
+Re-simulation incrémentale : phases en cache, reprise de GMAT depuis un checkpoint,
+recollage des rapports et comparaison des modes de désorbitation
+"""
+
+import math
+import shutil
+
+import pytest
+
+import script
+from conftest import MISSION_PARAMS
+
+
+def calculate(client, **overrides):
+    response = client.post('/api/calculate-mission', json=dict(MISSION_PARAMS, **overrides))
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def read_reports(mission_id):
+    mission_dir = script.get_config().missions_dir / mission_id
+    return {
+        name: script.GMATResultParser.parse_report_file(mission_dir / f'mission_{mission_id}_{name}.txt')
+        for name in ('satellite', 'upperstage')
+    }
+
+
+def assert_same_rows(rows, expected):
+    assert len(rows) == len(expected)
+    for row, expected_row in zip(rows, expected):
+        assert [k.split('.', 1)[1] for k in row] == [k.split('.', 1)[1] for k in expected_row]
+        # Première colonne : date UTCGregorian, les autres sont numériques
+        values, expected_values = list(row.values()), list(expected_row.values())
+        assert values[0] == expected_values[0]
+        for value, expected_value in zip(values[1:], expected_values[1:]):
+            assert math.isclose(float(value), float(expected_value), rel_tol=1e-9, abs_tol=1e-9)
+
+
+@pytest.fixture
+def gmat_calls(tmp_path, monkeypatch):
+    """Lignes de commande reçues par le faux GmatConsole"""
+    log_path = tmp_path / 'gmat_calls.log'
+    monkeypatch.setenv('FAKE_GMAT_LOG', str(log_path))
+    return lambda: log_path.read_text().splitlines() if log_path.exists() else []
+
+
+def test_resumed_mission_matches_full_run(client, gmat_calls):
+    calculate(client, deorbit_mode='rapid')
+    resumed = calculate(client, deorbit_mode='standard')
+    assert resumed['simulation'] == {
+        "reused_phases": ['coast'], "simulated_phases": ['deorbit_burn', 'descent']
+    }
+    assert gmat_calls()[-1].endswith(f"mission_{resumed['mission_id']}_resume.script")
+
+    # Cache vidé : la même mission est simulée en entier
+    checkpoints_dir = script.get_checkpoint_store().root
+    shutil.rmtree(checkpoints_dir)
+    checkpoints_dir.mkdir()
+    full = calculate(client, deorbit_mode='standard')
+    assert full['simulation']['reused_phases'] == []
+
+    resumed_reports, full_reports = read_reports(resumed['mission_id']), read_reports(full['mission_id'])
+    for name in ('satellite', 'upperstage'):
+        assert_same_rows(resumed_reports[name], full_reports[name])
+    assert resumed['metrics'] == full['metrics']
+
+
+def test_cached_mission_does_not_run_gmat(client, gmat_calls):
+    first = calculate(client)
+    second = calculate(client)
+
+    assert second['simulation'] == {"reused_phases": ['coast', 'deorbit_burn', 'descent'], "simulated_phases": []}
+    assert len(gmat_calls()) == 1
+    for name in ('satellite', 'upperstage'):
+        assert_same_rows(read_reports(second['mission_id'])[name], read_reports(first['mission_id'])[name])
+
+
+def test_resume_script_keeps_phase_durations(client):
+    calculate(client, deorbit_mode='rapid')
+    mission_id = calculate(client, deorbit_mode='gentle')['mission_id']
+
+    mission_dir = script.get_config().missions_dir / mission_id
+    for path in (mission_dir / f'mission_{mission_id}.script', mission_dir / f'mission_{mission_id}_resume.script'):
+        text = path.read_text()
+        assert 'BeginFiniteBurn DeorbitBurn(UpperStage);\nPropagate' in text
+        assert '{UpperStage.ElapsedSecs = 60}' in text
+        assert '{UpperStage.ElapsedSecs = 900}' in text
+
+
+def test_phase_rows_split_at_repeated_boundary_state():
+    rows = [(0.0, 'a'), (60.0, 'b'), (60.0, 'c'), (120.0, 'd')]
+
+    assert script.PhasedMissionRunner.phase_row_count(rows, 60.0) == 2
+    assert script.PhasedMissionRunner.phase_row_count(rows[2:], 120.0) == 2
+
+
+def test_phase_keys_shared_prefix_and_template_hash(monkeypatch):
+    def keys_for(deorbit_mode):
+        inputs = script.GMATScriptGenerator.mission_inputs(dict(MISSION_PARAMS, deorbit_mode=deorbit_mode))
+        return script.PhaseCheckpointStore.phase_keys(inputs, script.GMATScriptGenerator.mission_phases(inputs))
+
+    # Les modes partagent la phase coast, pas les suivantes
+    standard, rapid = keys_for('standard'), keys_for('rapid')
+    assert standard[0] == rapid[0]
+    assert standard[1] != rapid[1] and standard[2] != rapid[2]
+
+    # Modifier un template invalide toutes les phases en cache
+    monkeypatch.setattr(script, 'SCRIPT_TEMPLATES_HASH', 'changed')
+    assert not set(keys_for('standard')) & set(standard)
+
+
+def test_compare_deorbit_modes(client, gmat_calls):
+    params = {k: v for k, v in MISSION_PARAMS.items() if k != 'deorbit_mode'}
+    response = client.post('/api/compare-deorbit-modes', json=params)
+
+    assert response.status_code == 200
+    comparison = response.json['comparison']
+    assert [entry['deorbit_mode'] for entry in comparison] == ['rapid', 'standard', 'gentle']
+    assert all(entry['status'] == 200 for entry in comparison)
+    assert comparison[0]['simulation']['reused_phases'] == []
+    assert [entry['simulation']['reused_phases'] for entry in comparison[1:]] == [['coast'], ['coast']]
+    assert len(gmat_calls()) == 3
+
+    # Durées de burn 300, 120 et 60 s : le mode doux consomme aussi du carburant
+    fuel = [entry['metrics']['upper_stage_deorbit']['fuel_consumed_kg'] for entry in comparison]
+    assert fuel[0] > fuel[1] > fuel[2] > 0
+
+
+@pytest.mark.parametrize('modes', [[], ['fast'], 'rapid'])
+def test_compare_deorbit_modes_rejects_invalid_modes(client, modes):
+    params = {k: v for k, v in MISSION_PARAMS.items() if k != 'deorbit_mode'}
+    response = client.post('/api/compare-deorbit-modes', json=dict(params, modes=modes))
+    assert response.status_code == 400
@@ -0,0 +1,203 @@
+"""
+Bac à sable GMAT : données copiées ou liées, fichier de démarrage dérivé de
+l'installation, bacs à sable orphelins, et missions exécutées dans le bac à sable
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+from string import Template
+
+import pytest
+
+import script
+from conftest import MISSION_PARAMS
+
+
+@pytest.fixture
+def sandbox_config(tmp_path, backend_config):
+    backend_config['sandbox'] = {"enabled": True, "dir": str(tmp_path / 'sandboxes')}
+    return backend_config
+
+
+@pytest.fixture
+def sandbox_client(configure_backend, sandbox_config):
+    return configure_backend(sandbox_config)
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_prepare_removes_sandboxes_of_dead_processes(sandbox_client, sandbox_config):
+    root = script.get_config().sandbox_root
+    for name, owner in [('dead', {"hostname": socket.gethostname(), "pid": dead_pid()}),
+                        ('alive', {"hostname": socket.gethostname(), "pid": os.getppid()}),
+                        ('other-host', {"hostname": 'elsewhere', "pid": dead_pid()})]:
+        (root / name / 'data').mkdir(parents=True)
+        (root / name / script.GMATSandbox.OWNER_FILE).write_text(json.dumps(owner))
+    (root / 'no-owner').mkdir()
+
+    sandbox = script.GMATSandbox('fresh').prepare()
+
+    assert sorted(p.name for p in root.iterdir()) == ['alive', 'fresh', 'no-owner', 'other-host']
+    owner = json.loads((sandbox.path / script.GMATSandbox.OWNER_FILE).read_text())
+    assert owner == {"hostname": socket.gethostname(), "pid": os.getpid()}
+
+
+def test_api_processes_prepare_no_sandbox_in_spool_mode(configure_backend, sandbox_config):
+    sandbox_config['spool']['enabled'] = True
+    configure_backend(sandbox_config)
+
+    script.init_worker_process()
+
+    assert script.gmat_sandbox is None
+    assert not script.get_config().sandbox_root.exists()
+
+
+@pytest.fixture
+def gmat_data(gmat_install):
+    """Arborescence data/ réduite de l'installation GMAT (bin_dir/../data)"""
+    files = {
+        'gravity/earth/JGM2.cof': 'JGM2',
+        'gravity/luna/LP165P.cof': 'LP165P',
+        'atmosphere/earth/SpaceWeather-All-v1.2.txt': 'space weather',
+        'planetary_ephem/de/leDE1941.405': 'DE405',
+        'planetary_ephem/spk/de421.bsp': 'SPK',
+        'planetary_coeff/eopc04_08.62-now': 'EOP',
+        'time/tai-utc.dat': 'TAI-UTC',
+        'graphics/stars/inp_StarCatalog.txt': 'stars'
+    }
+    for relative, content in files.items():
+        path = gmat_install / 'data' / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return gmat_install / 'data'
+
+
+def test_mirror_copies_staged_data_and_links_the_rest(sandbox_client, gmat_data):
+    data_dir = script.GMATSandbox('mirror').prepare().data_dir
+
+    for staged in ('gravity/earth', 'atmosphere/earth', 'planetary_ephem/de', 'planetary_coeff', 'time'):
+        assert (data_dir / staged).is_dir() and not (data_dir / staged).is_symlink()
+    assert (data_dir / 'gravity/earth/JGM2.cof').read_text() == 'JGM2'
+    assert not (data_dir / 'gravity/earth/JGM2.cof').is_symlink()
+    assert not (data_dir / 'gravity').is_symlink()
+    for linked in ('gravity/luna', 'planetary_ephem/spk', 'graphics'):
+        assert (data_dir / linked).is_symlink()
+        assert (data_dir / linked).resolve() == (gmat_data / linked).resolve()
+
+
+def test_copy_if_changed_skips_identical_copies(tmp_path):
+    src, dst = tmp_path / 'JGM2.cof', tmp_path / 'copy.cof'
+    src.write_text('JGM2')
+    script.GMATSandbox.copy_if_changed(src, dst)
+    assert dst.read_text() == 'JGM2'
+
+    # Même taille et même date : la copie existante est gardée telle quelle
+    dst.write_text('XXXX')
+    os.utime(dst, (src.stat().st_atime, src.stat().st_mtime))
+    script.GMATSandbox.copy_if_changed(src, dst)
+    assert dst.read_text() == 'XXXX'
+
+    src.write_text('JGM2 updated')
+    script.GMATSandbox.copy_if_changed(src, dst)
+    assert dst.read_text() == 'JGM2 updated'
+
+
+def test_startup_file_points_to_the_sandbox(sandbox_client, gmat_install):
+    (gmat_install / 'bin' / 'gmat_startup_file.txt').write_text('\n'.join([
+        '# GMAT startup file',
+        'ROOT_PATH                  = ../',
+        'DATA_PATH                  = ROOT_PATH/data/',
+        'OUTPUT_PATH                = ../output/',
+        'MEASUREMENT_PATH           = ../output/measurements/',
+        'GMAT_INCLUDE_PATH          = ./include/',
+        'EARTH_POT_PATH             = DATA_PATH/gravity/earth/',
+        'PLUGIN                     = ../plugins/libGmatFunction',
+        'PLUGIN                     = ../plugins/libMatlabInterface',
+        'PLUGIN                     = ../plugins/proprietary/libVF13Optimizer',
+        '#PLUGIN                    = ../plugins/libOpenFramesInterface',
+        'RUN_MODE                   = ',
+    ]) + '\n')
+
+    sandbox = script.GMATSandbox('startup').prepare()
+    startup = sandbox.startup_file.read_text().splitlines()
+
+    install = gmat_install.resolve()
+    assert startup == [
+        '# GMAT startup file',
+        f'ROOT_PATH                  = {install}/',
+        f'DATA_PATH                  = {sandbox.data_dir}/',
+        f'OUTPUT_PATH                = {sandbox.output_dir}/',
+        f'MEASUREMENT_PATH           = {install}/output/measurements/',
+        f'GMAT_INCLUDE_PATH          = {install}/bin/include/',
+        'EARTH_POT_PATH             = DATA_PATH/gravity/earth/',
+        f'PLUGIN                     = {install}/plugins/libGmatFunction',
+        '# PLUGIN                     = ../plugins/libMatlabInterface  (disabled in AFREELEO sandbox)',
+        '# PLUGIN                     = ../plugins/proprietary/libVF13Optimizer  (disabled in AFREELEO sandbox)',
+        '#PLUGIN                    = ../plugins/libOpenFramesInterface',
+        'RUN_MODE                   = ',
+        f'LOG_FILE                   = {sandbox.output_dir}/GmatLog.txt',
+    ]
+
+
+def test_startup_file_without_install_startup_file(sandbox_client, gmat_install):
+    (gmat_install / 'bin' / 'gmat_startup_file.txt').unlink()
+
+    sandbox = script.GMATSandbox('bare').prepare()
+
+    assert sandbox.startup_file.read_text().splitlines() == [
+        f'ROOT_PATH                  = {gmat_install.resolve()}/',
+        f'DATA_PATH                  = {sandbox.data_dir}/',
+        f'OUTPUT_PATH                = {sandbox.output_dir}/',
+        f'LOG_FILE                   = {sandbox.output_dir}/GmatLog.txt',
+    ]
+
+
+def test_mission_runs_in_the_sandbox(sandbox_client, gmat_install, gmat_data, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_GMAT_LOG', str(tmp_path / 'gmat_calls.log'))
+
+    response = sandbox_client.post('/api/calculate-mission', json=MISSION_PARAMS)
+
+    assert response.status_code == 200
+    mission_id = response.json['mission_id']
+    sandbox = script.get_gmat_sandbox()
+    command = (tmp_path / 'gmat_calls.log').read_text().split()
+    assert command[:2] == ['--startup_file', str(sandbox.startup_file)]
+
+    mission_dir = script.get_config().missions_dir / mission_id
+    for name in ('satellite', 'upperstage'):
+        report = mission_dir / f'mission_{mission_id}_{name}.txt'
+        assert len(report.read_text().splitlines()) > 2
+    # Les rapports GMAT sont écrits dans le bac à sable, puis recollés dans le dossier de mission
+    assert list(sandbox.output_dir.glob('mission_*')) == []
+    assert not (gmat_install / 'output').exists()
+
+
+SCRIPT_TEMPLATES = [
+    script.MISSION_SCRIPT_TEMPLATE, script.KEPLERIAN_STATE_TEMPLATE, script.CARTESIAN_STATE_TEMPLATE,
+    script.PROPAGATE_TEMPLATE, script.CHECKPOINT_TEMPLATE, *script.MISSION_PHASE_TEMPLATES.values(),
+    'Cost: $$${amount} for $sat ($$ per kg)$$', '$name${name}$$$name', ''
+]
+
+
+@pytest.mark.parametrize('text', SCRIPT_TEMPLATES)
+def test_compiled_template_renders_like_string_template(text):
+    values = {name: f'<{name}:{i}>' for i, name in enumerate(Template(text).get_identifiers())}
+
+    rendered = script.GMATScriptGenerator.render(script.compile_script_template(text), values)
+
+    assert rendered == Template(text).substitute(values)
+
+
+@pytest.mark.parametrize('text', ['Cost: $5', 'sat.X = $ 1;', '${sat', '${1sat}'])
+def test_compile_rejects_invalid_placeholders(text):
+    with pytest.raises(ValueError, match='Invalid placeholder'):
+        script.compile_script_template(text)
+    with pytest.raises(ValueError):
+        Template(text).substitute({})
@@ -0,0 +1,255 @@
+"""
+Flotte de workers GMAT : spool partagé, baux, remise en file, endpoints /api/fleet
+et /api/missions/<id>/status. Plusieurs workers locaux et le faux GmatConsole.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import script
+from conftest import BACKEND_DIR, MISSION_PARAMS
+
+
+def wait_until(condition, timeout=20, interval=0.05):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(interval)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+def spool_client(configure_backend, backend_config):
+    backend_config['spool']['enabled'] = True
+    return configure_backend(backend_config)
+
+
+@pytest.fixture
+def start_worker():
+    """Lance des GMATWorker dans des threads du processus de test, arrêtés en fin de test"""
+    running = []
+
+    def start(worker_id, capacity=1):
+        worker = script.GMATWorker(script.get_mission_spool(), worker_id=worker_id, capacity=capacity)
+        thread = threading.Thread(target=worker.run, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        running.append((worker, thread))
+        return worker
+
+    yield start
+    for worker, thread in running:
+        worker.stop()
+    for worker, thread in running:
+        thread.join(timeout=30)
+
+
+def test_concurrent_claims_are_exclusive(tmp_path):
+    spool = script.MissionSpool(tmp_path / 'spool')
+    claimed, errors = [], []
+
+    def claim_all(worker_id):
+        try:
+            while True:
+                job = spool.claim(worker_id)
+                if job is None:
+                    return
+                claimed.append(job['mission_id'])
+        except Exception as e:
+            errors.append(e)
+
+    for round_index in range(20):
+        for i in range(8):
+            spool.submit(f'm{round_index}-{i}', {})
+        threads = [threading.Thread(target=claim_all, args=(f'w{n}',)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 160
+
+
+def test_expired_lease_is_requeued_and_only_new_holder_completes(tmp_path):
+    spool = script.MissionSpool(tmp_path / 'spool', lease_seconds=0.2)
+    spool.submit('m1', {})
+    assert spool.claim('A')['attempts'] == 1
+
+    time.sleep(0.3)
+    assert spool.requeue_expired() == ['m1']
+    job = spool.claim('B')
+    assert (job['worker_id'], job['attempts']) == ('B', 2)
+
+    # A a perdu son bail : il ne peut ni le renouveler ni retirer la mission de B
+    assert spool.renew('m1', 'A') is False
+    assert spool.complete('m1', 'A') is False
+    assert spool.renew('m1', 'B') is True
+    assert spool.job_status('m1') == {"status": "running", "worker_id": 'B', "attempts": 2}
+    assert spool.complete('m1', 'B') is True
+    assert spool.job_status('m1') is None
+
+
+def test_concurrent_requeue_never_moves_a_live_claim(tmp_path):
+    spool = script.MissionSpool(tmp_path / 'spool', lease_seconds=60)
+    claims, requeued, errors = [], [], []
+    lock = threading.Lock()
+
+    def requeue(stop):
+        try:
+            while not stop.is_set():
+                missions = spool.requeue_expired()
+                with lock:
+                    requeued.extend(missions)
+        except Exception as e:
+            errors.append(e)
+
+    def claim(worker_id, stop):
+        try:
+            while not stop.is_set():
+                job = spool.claim(worker_id)
+                if job is not None:
+                    with lock:
+                        claims.append(job)
+        except Exception as e:
+            errors.append(e)
+
+    for round_index in range(20):
+        # Missions d'un worker mort : bail expiré, à remettre en file une seule fois
+        for i in range(8):
+            mission_id = f'm{round_index}-{i}'
+            spool.submit(mission_id, {})
+        while (job := spool.claim('dead')) is not None:
+            script.write_json_atomic(spool.claimed_dir / f"{job['mission_id']}.json", dict(job, lease_expires=0))
+
+        stop = threading.Event()
+        threads = [threading.Thread(target=requeue, args=(stop,)) for _ in range(4)]
+        threads += [threading.Thread(target=claim, args=(f'w{n}', stop)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            wait_until(lambda: len(claims) == 8 * (round_index + 1) or errors, timeout=10)
+            time.sleep(0.02)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    assert errors == []
+    assert len(requeued) == len(claims) == 160
+    assert sorted(job['mission_id'] for job in claims) == sorted(requeued)
+    assert list(spool.pending_dir.glob('*.json')) == []
+    for path in spool.claimed_dir.glob('*.json'):
+        assert script.MissionSpool._read_json(path)['attempts'] == 2
+    assert list(spool.claimed_dir.glob('.*')) == []
+
+
+@pytest.mark.parametrize('heartbeat_seconds', [30, 60, 90])
+def test_heartbeat_must_renew_leases_in_time(backend_config, heartbeat_seconds):
+    backend_config['spool'].update(lease_seconds=60, heartbeat_seconds=heartbeat_seconds)
+
+    with pytest.raises(ValueError, match='heartbeat_seconds'):
+        script.BackendConfig(backend_config)
+
+
+def test_mission_fails_after_max_attempts(spool_client):
+    spool = script.get_mission_spool()
+    spool.lease_seconds, spool.max_attempts = 0.1, 1
+    spool.submit('m1', MISSION_PARAMS)
+    spool.claim('dead')
+    time.sleep(0.2)
+
+    assert spool.requeue_expired() == []
+    response = spool_client.get('/api/missions/m1/status')
+    assert response.json['status'] == 'failed'
+    assert response.json['error'] == 'GMAT worker lost'
+
+
+def test_unreadable_job_does_not_stop_claims(tmp_path):
+    spool = script.MissionSpool(tmp_path / 'spool')
+    (spool.pending_dir / 'broken.json').write_text('{"mission_id": ')
+    spool.submit('m1', {})
+
+    assert spool.claim('A')['mission_id'] == 'm1'
+    assert (spool.failed_dir / 'broken.json').exists()
+
+
+def test_lost_lease_discards_results(client, backend_config):
+    payload, status = script.execute_mission(MISSION_PARAMS, 'lost', owns_mission=lambda: False)
+
+    assert status == 409
+    mission_dir = script.get_config().missions_dir / 'lost'
+    assert not (mission_dir / 'results.json').exists()
+    assert not (mission_dir / 'mission_lost_satellite.txt').exists()
+
+
+def test_fleet_runs_missions_on_several_workers(spool_client, start_worker):
+    start_worker('node1-a', capacity=2)
+    start_worker('node2-a', capacity=2)
+    wait_until(lambda: spool_client.get('/api/fleet').json['alive_workers'] == 2)
+
+    fleet = spool_client.get('/api/fleet').json
+    assert fleet['spool_enabled'] is True
+    assert fleet['total_capacity'] == 4
+    assert {w['worker_id'] for w in fleet['workers']} == {'node1-a', 'node2-a'}
+
+    app = script.create_app()
+
+    def calculate(index):
+        with app.test_client() as client:
+            return client.post('/api/calculate-mission', json=dict(MISSION_PARAMS, mission_name=f'Fleet {index}'))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(calculate, range(4)))
+
+    assert [r.status_code for r in responses] == [200] * 4
+    for response in responses:
+        status = spool_client.get(f"/api/missions/{response.json['mission_id']}/status")
+        assert status.json['status'] == 'completed'
+    assert spool_client.get('/api/fleet').json['queue'] == {"pending": 0, "claimed": 0, "failed": 0}
+
+
+def test_status_of_queued_mission(spool_client):
+    mission_id = script.submit_mission(MISSION_PARAMS)
+
+    assert spool_client.get(f'/api/missions/{mission_id}/status').json == {
+        "mission_id": mission_id, "status": "queued"
+    }
+    assert spool_client.get('/api/missions/unknown/status').status_code == 404
+
+
+def test_missions_of_a_dead_worker_are_requeued(spool_client, backend_config, write_config, start_worker):
+    config_path = write_config(dict(backend_config, spool=dict(backend_config['spool'], enabled=True)))
+    env = dict(os.environ, AFREELEO_CONFIG=str(config_path), FAKE_GMAT_SLEEP='30')
+    dead = subprocess.Popen([sys.executable, 'script.py', 'worker', '--worker-id', 'doomed'],
+                            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        mission_id = script.submit_mission(MISSION_PARAMS)
+        spool = script.get_mission_spool()
+        wait_until(lambda: (spool.job_status(mission_id) or {}).get('worker_id') == 'doomed')
+    finally:
+        dead.send_signal(signal.SIGKILL)
+        dead.wait()
+
+    start_worker('rescuer')
+    payload, status = script.wait_for_mission(mission_id, timeout=30)
+
+    assert status == 200
+    assert payload['mission_id'] == mission_id
+    fleet = spool_client.get('/api/fleet').json
+    assert [w['worker_id'] for w in fleet['workers'] if w['alive']] == ['rescuer']
+
+
+def test_fleet_and_status_without_spool(client, backend_config):
+    assert client.get('/api/fleet').json == {"spool_enabled": False}
+    assert client.get('/api/missions/unknown/status').status_code == 404
+    assert not os.path.exists(backend_config['spool']['dir'])